@@ -6,11 +6,12 @@ manages conversation state. It provides a clean interface for text-based interac
 """
 
 import logging
-from uuid import uuid4
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 
-from max_assistant.config import DEFAULT_USERNAME, TTS_VOICE
-from max_assistant.agent.state import GraphState
+from max_assistant.config import DEFAULT_USERNAME
+from max_assistant.agent.state import GraphState, ConversationState
+from max_assistant.utils.datetime_utils import pin_turn_datetime
+from max_assistant.utils.text_utils import is_raw_tool_call, split_sentences
 
 logger = logging.getLogger(__name__)
 
@@ -19,47 +20,94 @@ class Agent:
 
     def __init__(self, reasoning_engine, initial_user_info: Dict[str, Any]):
         self.reasoning_engine = reasoning_engine
-        self.conversation_state: GraphState = {
-            "messages": [],
-            "userinfo": initial_user_info,
-            "thread_id": str(uuid4()),
-            "transcribed_text": "",
-            "voice": TTS_VOICE
-        }
+        self.conversation_state = ConversationState(userinfo=initial_user_info)
         user_name = initial_user_info.get("user", {}).get("firstName", DEFAULT_USERNAME)
-        logger.info(f"Agent initialized for user: {user_name}")
-
-    async def ainvoke(self, text_input: str) -> str:
-        """Invokes the agent with text input and returns the text response."""
+        logger.info("Agent initialized for user: %s", user_name)
 
-        inputs: GraphState = {
+    def _build_inputs(self, text_input: str) -> GraphState:
+        """Builds the graph input for a new turn from the conversation state."""
+        state = self.conversation_state
+        return {
             "transcribed_text": text_input,
-            "messages": self.conversation_state.get("messages", []),
-            "userinfo": self.conversation_state.get("userinfo", {}),
-            "thread_id": self.conversation_state.get("thread_id"),
-            "voice": self.conversation_state.get("voice", TTS_VOICE)
+            "messages": state.messages,
+            "userinfo": state.userinfo,
+            "thread_id": state.thread_id,
+            "voice": state.voice
         }
-        logger.info(f"Calling Reasoning engine with: {text_input}")
+
+    async def ainvoke_text(self, text_input: str) -> str:
+        """Invokes the agent for a text-only client and returns the text response."""
+        inputs = self._build_inputs(text_input)
+        logger.info("Calling Reasoning engine with: %s", text_input)
+        pin_turn_datetime()
         final_state = await self.reasoning_engine.ainvoke(inputs)
-        self.conversation_state = final_state
+        self.conversation_state.messages = final_state["messages"]
+        return self.get_last_response()
+
+    async def astream(self, text_input: str) -> AsyncIterator[str]:
+        """
+        Invokes the agent with text input and yields the response sentence by
+        sentence as the LLM generates it. The conversation state is updated
+        once the turn completes; use get_last_response() for the full text.
+        """
+        inputs = self._build_inputs(text_input)
+        logger.info("Streaming Reasoning engine with: %s", text_input)
+        # Set here rather than in a graph node: node tasks copy this context, but
+        # values set inside one node don't reach the others.
+        pin_turn_datetime()
+
+        buffer = ""
+        suppress = False  # Set when the model is writing a raw JSON tool call
+        async for event in self.reasoning_engine.astream_events(inputs, version="v2"):
+            kind = event["event"]
+
+            if kind == "on_chat_model_start":
+                buffer, suppress = "", False
+
+            elif kind == "on_chat_model_stream":
+                if suppress:
+                    continue
+                buffer += event["data"]["chunk"].content
+                if is_raw_tool_call(buffer):
+                    suppress = True
+                    continue
+                if buffer.lstrip().startswith("{"):
+                    continue  # Held back until it can be told apart from a raw tool call
+                sentences, buffer = split_sentences(buffer)
+                for sentence in sentences:
+                    yield sentence
 
-        llm_response = ""
-        if final_state.get("messages") and len(final_state["messages"]) > 0:
-            last_message = final_state["messages"][-1]
-            llm_response = last_message.content
+            elif kind == "on_chat_model_end":
+                # Flush what is left, unless this response is a tool call.
+                output = event["data"].get("output")
+                if not suppress and not getattr(output, "tool_calls", None) and not is_raw_tool_call(buffer):
+                    sentences, buffer = split_sentences(buffer)
+                    for sentence in sentences:
+                        yield sentence
+                    if buffer.strip():
+                        yield buffer.strip()
+                buffer = ""
 
-        return llm_response
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # The outermost run is the graph itself; its output is the final state.
+                self.conversation_state.messages = event["data"]["output"]["messages"]
 
+    def get_last_response(self) -> str:
+        """Returns the content of the last message in the conversation."""
+        messages = self.conversation_state.messages
+        if messages:
+            return messages[-1].content
+        return ""
 
     def set_thread_id(self, thread_id: str):
-        self.conversation_state["thread_id"] = thread_id
-        logger.info(f"Thread ID set to {thread_id}")
+        self.conversation_state.thread_id = thread_id
+        logger.info("Thread ID set to %s", thread_id)
 
     def set_voice(self, voice: str):
         """Sets the TTS voice for the conversation."""
-        self.conversation_state["voice"] = voice
+        self.conversation_state.voice = voice
 
     def get_voice(self) -> str:
         """Gets the current TTS voice."""
-        return self.conversation_state.get("voice", TTS_VOICE)
+        return self.conversation_state.voice
 
@@ -5,7 +5,7 @@ This module defines a framework for managing conversation history and invoking a
 to generate responses. It includes mechanisms for pruning conversation history to ensure efficient interaction
 with the LLM, as well as a configurable reasoning engine implemented as a state graph.
 
-The module initializes an LLM using the ChatOllama model, constructs conversation nodes for pruning messages
+The module initializes an LLM using the ChatOllama model, constructs conversation nodes for preparing input
 and generating AI responses, and builds an execution graph workflow for multi-node communication.
 The reasoning engine incorporates both stateful and asynchronous operations to handle conversational data.
 
@@ -14,12 +14,15 @@ chat applications or AI-powered assistants.
 """
 
 import logging
-import json
-from typing import Literal, List
+import time
+from typing import Literal, List, Dict, Any
 import uuid
+import orjson
 
 from langchain_core.messages import HumanMessage, ToolMessage, AIMessage, ToolCall
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode
 from langchain_ollama import ChatOllama
 
@@ -27,42 +30,32 @@ from max_assistant.agent.prompts import senior_assistant_prompt
 from max_assistant.agent.state import GraphState
 from max_assistant.tools.registry import ToolRegistry
 from max_assistant.tools.time_tools import get_current_datetime
-from max_assistant.config import MESSAGE_PRUNING_LIMIT
-from max_assistant.utils.datetime_utils import current_datetime
+from max_assistant.utils.datetime_utils import turn_datetime
+from max_assistant.utils.text_utils import is_raw_tool_call
 
 logger = logging.getLogger(__name__)
 
-def prune_messages(state: GraphState):
-    """
-    Node to prune the history, keeping only the last K messages.
-    """
-    messages = state["messages"]
-    if len(messages) > MESSAGE_PRUNING_LIMIT:
-        logger.info(f"--- Pruning messages from {len(messages)} down to {MESSAGE_PRUNING_LIMIT} ---")
-        # This overwrites the 'messages' key in the state with the pruned list
-        return {"messages": messages[-MESSAGE_PRUNING_LIMIT:]}
-
-    # If no pruning is needed, we don't need to modify the state
-    return {}
-
-
 # --- Build the Graph ---
 async def create_reasoning_engine(
         llm: ChatOllama,
-        tool_registry: ToolRegistry,):
-    """Builds the graph with pruning, model calls, and tool execution."""
+        tool_registry: ToolRegistry,) -> CompiledStateGraph:
+    """
+    Builds the graph with input preparation, model calls, and tool execution.
+    """
 
     # 1. Initialize Tools from the registry
     logger.info("Collecting tools from registry...")
     tools = tool_registry.get_all_tools()
     tools.append(get_current_datetime)  # Add standalone tools
     llm_with_tools = llm.bind_tools(tools)
-    logger.info(f"Reasoning engine configured with {len(tools)} tools.")
+    logger.info("Reasoning engine configured with %d tools.", len(tools))
 
     # 2. Define Nodes that will be part of the graph
 
     def prepare_input(state: GraphState):
         """
+        Node to add the user's input to the history. The 'messages' reducer keeps
+        the history bounded, so no separate pruning step is needed.
         """
         logger.info("Node: prepare_input")
         # We only add the user's input if it's a new turn.
@@ -70,35 +63,47 @@ async def create_reasoning_engine(
         # and should not add the user's input again.
         last_message = state["messages"][-1] if state["messages"] else None
         if not isinstance(last_message, ToolMessage):
-            return {"messages": [HumanMessage(content=state["transcribed_text"])]}
+            # Stamp the turn's datetime on the message rather than the system prompt,
+            # so the prompt prefix up to this message is unchanged from the last turn.
+            content = f"{state['transcribed_text']}\n\nCurrent Datetime: {turn_datetime()}"
+            return {"messages": [HumanMessage(content=content)]}
         return {}
 
-    async def call_model(state: GraphState):
+    async def call_model(state: GraphState, config: RunnableConfig):
         """
         Node to invoke the LLM with the current state. The user's input is already
         in the message history.
         """
         logger.info("Calling model with current history.")
 
-        # The prompt and LLM with tools are combined to form the chain
-        chain = senior_assistant_prompt | llm_with_tools
-
         # The 'messages' in the state now contains the user's latest input.
-        response = await chain.ainvoke({
+        prompt_inputs = {
             "user_info": state["userinfo"],
-            "current_datetime": current_datetime(),
-            "messages": state["messages"],
-        })
+            # The prompt's MessagesPlaceholder requires a list, convert at the boundary.
+            "messages": list(state["messages"]),
+        }
 
-        logger.info(f"Model produced: {response.content}")
+        prompt_value = await senior_assistant_prompt.ainvoke(prompt_inputs, config)
+
+        # Pass the node's config through so the LLM call stays part of this run
+        # (callbacks, streamed tokens). Concurrent sessions' calls are batched by
+        # the Ollama server itself (OLLAMA_NUM_PARALLEL).
+        response = await llm_with_tools.ainvoke(prompt_value, config)
+
+        logger.info("Model produced: %s", response.content)
 
         if response.tool_calls:
             # It's a standard tool call, just return it
             return {"messages": [response]}
 
+        content = response.content if isinstance(response.content, str) else ""
+        if not is_raw_tool_call(content):
+            # A regular text response; only parse what looks like a raw tool call.
+            return {"messages": [response]}
+
         try:
             # Check if the *content* is a JSON tool call
-            content_json = json.loads(response.content)
+            content_json = orjson.loads(content)
             if isinstance(content_json, dict) and "name" in content_json:
                 logger.warning("Raw JSON tool call detected. Re-formatting message.")
 
@@ -118,11 +123,10 @@ async def create_reasoning_engine(
                 )
                 return {"messages": [new_response]}
 
-        except (json.JSONDecodeError, TypeError):
-            # It's just a regular text response, not JSON
+        except orjson.JSONDecodeError:
+            # Text that merely starts with a brace, not JSON
             pass
 
-            # It's a regular text response, return it as-is
         return {"messages": [response]}
 
     def should_continue(state: GraphState) -> Literal["execute_tools", "end"]:
@@ -139,14 +143,12 @@ async def create_reasoning_engine(
     workflow = StateGraph(GraphState)
 
     workflow.add_node("prepare_input", prepare_input)
-    workflow.add_node("prune", prune_messages)
     workflow.add_node("agent", call_model)
     workflow.add_node("execute_tools", ToolNode(tools))
 
     # 4. Add edges
     workflow.set_entry_point("prepare_input")
-    workflow.add_edge("prepare_input", "prune")
-    workflow.add_edge("prune", "agent")
+    workflow.add_edge("prepare_input", "agent")
     workflow.add_conditional_edges(
         "agent",
         should_continue,
@@ -158,4 +160,20 @@ async def create_reasoning_engine(
     workflow.add_edge("execute_tools", "agent")
 
     # 5. Compile and return
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
+
+
+async def warm_up_reasoning_engine(reasoning_engine: CompiledStateGraph, user_info: Dict[str, Any]):
+    """
+    Does the first-use setup that the first real turn would otherwise pay for,
+    without an LLM request: renders the main prompt once, as call_model does,
+    and builds the compiled graph's structure.
+    """
+    logger.info("Warming up reasoning engine...")
+    start_time = time.monotonic()
+    await senior_assistant_prompt.ainvoke({
+        "user_info": user_info,
+        "messages": [HumanMessage(content=f"Hello\n\nCurrent Datetime: {turn_datetime()}")],
+    })
+    reasoning_engine.get_graph()
+    logger.info("Reasoning engine warm-up complete in %.2f seconds.", time.monotonic() - start_time)
@@ -3,10 +3,30 @@
 """
 Defines the state for the langgraph graph.
 """
-from typing import TypedDict, Annotated
-import operator
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TypedDict, Annotated, Iterable
+from uuid import uuid4
 from langchain_core.messages import BaseMessage
 
+from max_assistant.config import MESSAGE_PRUNING_LIMIT, TTS_VOICE
+
+
+def add_messages_bounded(
+        left: Iterable[BaseMessage],
+        right: Iterable[BaseMessage]
+) -> deque[BaseMessage]:
+    """
+    Reducer for the 'messages' channel.
+    Returns a new deque bounded by MESSAGE_PRUNING_LIMIT holding the existing and
+    new messages, so the oldest are evicted without slicing the history. The
+    existing deque must not be changed in place: LangGraph still holds it as the
+    channel's current value, and mutating it would apply the update twice.
+    """
+    messages = deque(left, maxlen=MESSAGE_PRUNING_LIMIT)
+    messages.extend(right)
+    return messages
+
 
 class GraphState(TypedDict):
     """
@@ -15,10 +35,28 @@ class GraphState(TypedDict):
     Attributes:
         transcribed_text: The user's transcribed text for the current turn.
         username: The user's name.
-        messages: The full conversation history, which will be pruned.
+        messages: The conversation history, bounded to the last MESSAGE_PRUNING_LIMIT messages.
     """
     transcribed_text: str
     userinfo: dict
     thread_id: str
-    messages: Annotated[list[BaseMessage], operator.add]
-    voice: str
\ No newline at end of file
+    messages: Annotated[deque[BaseMessage], add_messages_bounded]
+    voice: str
+
+
+@dataclass(slots=True)
+class ConversationState:
+    """
+    The state an Agent carries between turns. Only the per-turn graph input is
+    built as a GraphState dict; between turns the fields are plain attributes.
+
+    Attributes:
+        userinfo: The user's details, passed into every prompt.
+        thread_id: Identifies the conversation.
+        voice: The TTS voice for responses.
+        messages: The conversation history, bounded to the last MESSAGE_PRUNING_LIMIT messages.
+    """
+    userinfo: dict
+    thread_id: str = field(default_factory=lambda: str(uuid4()))
+    voice: str = TTS_VOICE
+    messages: deque[BaseMessage] = field(default_factory=lambda: deque(maxlen=MESSAGE_PRUNING_LIMIT))
@@ -9,18 +9,22 @@ import logging
 import asyncio
 from langchain_ollama import ChatOllama
 from langchain_core.runnables import RunnableSerializable
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 from max_assistant.config import (
-    NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD,
-    OLLAMA_MODEL_NAME, OLLAMA_BASE_URL
+    NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, NEO4J_MAX_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT,
+    OLLAMA_MODEL_NAME, OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, OLLAMA_KEEP_ALIVE_INTERVAL,
+    OLLAMA_WARMUP_TIMEOUT, OLLAMA_NUM_CTX, LLM_MAX_PARALLEL
 )
 from max_assistant.clients.neo4j_client import Neo4jClient
-from max_assistant.clients.ollama_preloader import create_llm_instance, preload_model_async
+from max_assistant.clients.stt_client import STTConnectionPool
+from max_assistant.clients.ollama_preloader import (
+    create_llm_instance, preload_model_async, keep_model_alive
+)
 from max_assistant.tools import ALL_TOOL_PROVIDERS
 from max_assistant.tools.registry import ToolRegistry
 from max_assistant.tools.person_tools import PersonTools
-from max_assistant.agent.graph import create_reasoning_engine
+from max_assistant.agent.graph import create_reasoning_engine, warm_up_reasoning_engine
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +46,9 @@ class AppServices:
             tool_registry: ToolRegistry,
             user_info: Dict[str, Any],
             reasoning_engine: ReasoningEngine,
-            llm_ready_event: asyncio.Event
+            llm_ready_event: asyncio.Event,
+            background_tasks: List[asyncio.Task] | None = None,
+            stt_pool: STTConnectionPool | None = None
     ):
         self.db_client = db_client
         self.llm = llm
@@ -50,12 +56,15 @@ class AppServices:
         self.user_info = user_info
         self.reasoning_engine = reasoning_engine
         self.llm_ready_event = llm_ready_event
+        self.background_tasks = background_tasks or []
+        self.stt_pool = stt_pool
 
     @classmethod
-    async def create(cls) -> "AppServices":
+    async def create(cls, enable_stt_pool: bool = False) -> "AppServices":
         """
         Asynchronously creates and initializes all application services.
         This is the single source of truth for service setup.
+        Set enable_stt_pool to keep prewarmed STT connections for voice clients.
         """
         logger.info("Initializing application services...")
         try:
@@ -74,9 +83,22 @@ class AppServices:
 
             # --- 4. Create Reasoning Engine ---
             reasoning_engine = await create_reasoning_engine(llm, tool_registry)
+            await warm_up_reasoning_engine(reasoning_engine, user_info)
             logger.info("Reasoning engine initialized.")
 
-            # --- 5. Create and return the container instance ---
+            # --- 5. Start background maintenance tasks ---
+            background_tasks = []
+            if OLLAMA_KEEP_ALIVE_INTERVAL > 0:
+                background_tasks.append(
+                    asyncio.create_task(keep_model_alive(llm, OLLAMA_KEEP_ALIVE_INTERVAL))
+                )
+
+            stt_pool = None
+            if enable_stt_pool:
+                stt_pool = STTConnectionPool()
+                stt_pool.start()
+
+            # --- 6. Create and return the container instance ---
             return cls(
                 db_client=db_client,
                 llm=llm,
@@ -84,12 +106,27 @@ class AppServices:
                 user_info=user_info,
                 reasoning_engine=reasoning_engine,
                 llm_ready_event=llm_ready_event,
+                background_tasks=background_tasks,
+                stt_pool=stt_pool,
             )
 
         except Exception as e:
             logger.critical(f"Failed to initialize application services: {e}", exc_info=True)
             raise
 
+    async def close(self):
+        """Cancels background tasks and closes client and pooled connections."""
+        for task in self.background_tasks:
+            task.cancel()
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+
+        if self.stt_pool:
+            await self.stt_pool.close()
+
+        logger.info("Closing Neo4j client connection...")
+        if self.db_client:
+            await self.db_client.close()
+
     @staticmethod
     async def _initialize_clients(llm_ready_event: asyncio.Event) -> Tuple[Neo4jClient, ChatOllama]:
         """Initializes the Neo4j client and the Ollama LLM concurrently."""
@@ -97,13 +134,22 @@ class AppServices:
 
         async def _init_llm_and_warmup() -> ChatOllama:
             """Creates LLM instance and starts warm-up in a background task."""
-            llm = create_llm_instance(OLLAMA_MODEL_NAME, OLLAMA_BASE_URL, temperature=0)
-            asyncio.create_task(preload_model_async(llm, ready_event=llm_ready_event))
+            llm = create_llm_instance(
+                OLLAMA_MODEL_NAME, OLLAMA_BASE_URL, temperature=0, keep_alive=OLLAMA_KEEP_ALIVE,
+                max_keepalive_connections=LLM_MAX_PARALLEL, num_ctx=OLLAMA_NUM_CTX or None
+            )
+            asyncio.create_task(
+                preload_model_async(llm, ready_event=llm_ready_event, timeout=OLLAMA_WARMUP_TIMEOUT)
+            )
             logger.info("LLM warm-up process started in the background.")
             return llm
 
         results = await asyncio.gather(
-            Neo4jClient.create(NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD),
+            Neo4jClient.create(
+                NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD,
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT
+            ),
             _init_llm_and_warmup()
         )
         db_client, llm = results[0], results[1]
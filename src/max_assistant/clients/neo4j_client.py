@@ -4,7 +4,7 @@ from typing import cast, LiteralString, Any, Dict
 import asyncio
 import json
 
-from neo4j import AsyncGraphDatabase, AsyncDriver
+from neo4j import AsyncGraphDatabase, AsyncDriver, RoutingControl
 from neo4j.exceptions import Neo4jError, DriverError, ServiceUnavailable
 
 import logging
@@ -34,11 +34,15 @@ class Neo4jClient:
             database="neo4j",
             max_retries=5,
             initial_delay=3,
-            backoff_factor=2
+            backoff_factor=2,
+            max_connection_pool_size=50,
+            connection_acquisition_timeout=5.0
     ):
         """
         Asynchronous factory method to create and verify a client.
         Includes retry-with-backoff logic for startup.
+        Connectivity is verified once here; queries then reuse the driver's
+        keep-alive connection pool.
         """
         delay = initial_delay
 
@@ -49,8 +53,19 @@ class Neo4jClient:
                     f"Attempt {attempt}/{max_retries}: Connecting to "
                     f"Neo4j Async Driver URI: {uri} User: {user}..."
                 )
-                driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
-                await driver.verify_connectivity()
+                driver = AsyncGraphDatabase.driver(
+                    uri,
+                    auth=(user, password),
+                    max_connection_pool_size=max_connection_pool_size,
+                    connection_acquisition_timeout=connection_acquisition_timeout,
+                    keep_alive=True,
+                )
+                try:
+                    await driver.verify_connectivity()
+                except BaseException:
+                    # Release the failed driver's pool before retrying
+                    await driver.close()
+                    raise
 
                 logger.info("Neo4j Async Driver connected successfully.")
                 return cls(driver, database)
@@ -95,6 +110,7 @@ class Neo4jClient:
             # You can remove the config map for a full (slower) scan.
             schema_result = await self.driver.execute_query(
                 "CALL apoc.meta.schema({sample: 1000})",
+                routing_=RoutingControl.READ,
                 database_=self.database
             )
 
@@ -185,9 +201,16 @@ class Neo4jClient:
             await self.driver.close()
             logger.info("Neo4j Async Driver connection closed.")
 
-    async def execute_query(self, query: str, params: dict[str, Any] | None = None) -> Dict[str, Any]:
+    async def execute_query(
+            self,
+            query: str,
+            params: dict[str, Any] | None = None,
+            read_only: bool = False
+    ) -> Dict[str, Any]:
         """
         Executes a query using the native async driver.
+        Set read_only for queries that don't write, so the driver routes them to
+        a reader (and the server rejects any accidental writes).
         """
         if not self.driver:
             return{"error": "Neo4j is not connected"}
@@ -198,6 +221,7 @@ class Neo4jClient:
             result = await self.driver.execute_query(
                 cast(LiteralString, query),
                 parameters_=(params or {}),
+                routing_=RoutingControl.READ if read_only else RoutingControl.WRITE,
                 database_=self.database
             )
 
@@ -225,8 +249,7 @@ class Neo4jClient:
             return response
 
         # --- 4. Query failed ---
-        except (Neo4jError, DriverError) as e:
-            return {"error": e.__class__.__name__, "message": str(e)}
-        except Exception as e:
+        # TypeError/ValueError cover parameters the driver can't serialize.
+        except (Neo4jError, DriverError, TypeError, ValueError) as e:
             return {"error": e.__class__.__name__, "message": str(e)}
 
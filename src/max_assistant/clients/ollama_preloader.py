@@ -2,11 +2,9 @@ import time
 import httpx
 import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Union
 
 from langchain_ollama import ChatOllama
-from langchain_core.runnables import RunnableConfig
-from langchain_core.output_parsers import StrOutputParser
 
 logger = logging.getLogger(__name__)
 
@@ -15,20 +13,39 @@ def create_llm_instance(
         model_name: str,
         base_url: str = "http://localhost:11434",
         temperature: float = 0.0,
+        keep_alive: Optional[Union[int, str]] = None,
+        max_keepalive_connections: int = 8,
+        keepalive_expiry: float = 120.0,
+        num_ctx: Optional[int] = None,
 ) -> ChatOllama:
     """
     Synchronously initializes and returns a ChatOllama instance.
+    A single instance should be shared for the application, with keep_alive set so
+    Ollama keeps the model and its cached prompt prefix loaded between turns.
+    Its HTTP client keeps idle connections open (one per parallel request),
+    so each turn reuses a warm socket instead of reconnecting.
+    num_ctx sets the context window; None leaves the model's default.
     """
     logger.info("=" * 50)
     logger.info("🚀 Initializing Ollama instance...")
     logger.info(f"   Model: {model_name}")
     logger.info(f"   Target: {base_url}")
+    logger.info(f"   Keep alive: {keep_alive}")
+    logger.info(f"   Context window: {num_ctx or 'model default'}")
     logger.info("=" * 50)
 
     llm = ChatOllama(
         model=model_name,
         base_url=base_url,
         temperature=temperature,
+        keep_alive=keep_alive,
+        num_ctx=num_ctx,
+        client_kwargs={
+            "limits": httpx.Limits(
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        },
     )
     return llm
 
@@ -36,18 +53,18 @@ def create_llm_instance(
 async def preload_model_async(
         llm: ChatOllama,
         ready_event: Optional[asyncio.Event] = None,
-        keep_alive: str = "-1",
         max_retries: int = 10,
-        retry_delay: int = 2
+        retry_delay: int = 2,
+        timeout: Optional[float] = None
 ):
     """
     Asynchronously preloads a model in Ollama with retry logic.
     This is designed to be run as a background task. It will set the
-    provided asyncio.Event upon completion or failure.
+    provided asyncio.Event upon completion or failure. If timeout is set,
+    an attempt that takes longer is abandoned so clients aren't kept waiting.
+    The model is loaded with the LLM's keep_alive and context window, without
+    generating any tokens.
     """
-    parser = StrOutputParser()
-    chain = llm | parser
-
     retries = 0
     try:
         while retries < max_retries:
@@ -55,9 +72,9 @@ async def preload_model_async(
                 logger.info(f"🔥 Sending async warm-up request to load '{llm.model}' into memory.")
                 start_time = time.monotonic()
 
-                await chain.ainvoke(
-                    "Hi",
-                    config=RunnableConfig(configurable={"keep_alive": keep_alive})
+                await asyncio.wait_for(
+                    load_model_async(llm.base_url, llm.model, llm.keep_alive, num_ctx=llm.num_ctx),
+                    timeout=timeout
                 )
 
                 end_time = time.monotonic()
@@ -78,6 +95,9 @@ async def preload_model_async(
                     logging.error(
                         f"Exceeded maximum retries for warm-up of '{llm.model}'. The model may not be preloaded.")
                     return
+            except asyncio.TimeoutError:
+                logging.error(f"Warm-up of '{llm.model}' timed out after {timeout} seconds. The model may not be preloaded.")
+                return
             except Exception as e:
                 logging.error(f"\n❌ FAILED TO WARM UP OLLAMA for model '{llm.model}'.")
                 logging.error(f"   Error: {e}")
@@ -85,3 +105,46 @@ async def preload_model_async(
     finally:
         if ready_event:
             ready_event.set()
+
+
+async def load_model_async(
+        base_url: str,
+        model_name: str,
+        keep_alive: Optional[Union[int, str]] = None,
+        timeout: float = 600.0,
+        num_ctx: Optional[int] = None
+):
+    """
+    Asks Ollama to load a model into memory without generating any tokens.
+    A /api/generate request without a prompt is treated by Ollama as a pure load,
+    which also resets the model's keep_alive timer. Pass the same num_ctx the chat
+    requests use, otherwise Ollama reloads the model on the first turn.
+    """
+    payload = {"model": model_name}
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if num_ctx is not None:
+        payload["options"] = {"num_ctx": num_ctx}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        response = await client.post("/api/generate", json=payload)
+        response.raise_for_status()
+
+
+async def keep_model_alive(llm: ChatOllama, interval: float):
+    """
+    Periodically reloads the model so the first user turn after an idle period
+    (or an Ollama restart) doesn't pay the model-load penalty.
+    This is designed to be run as a background task until cancelled.
+    """
+    logger.info(f"Keeping model '{llm.model}' alive every {interval:.0f} seconds.")
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await load_model_async(llm.base_url, llm.model, llm.keep_alive, num_ctx=llm.num_ctx)
+                logger.debug(f"Keep-alive request sent for model '{llm.model}'.")
+            except httpx.HTTPError as e:
+                logger.warning(f"Keep-alive request for model '{llm.model}' failed: {e}")
+    except asyncio.CancelledError:
+        logger.info("Model keep-alive task cancelled.")
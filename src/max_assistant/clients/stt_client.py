@@ -1,25 +1,97 @@
 import asyncio
 import logging
-from websockets.asyncio.client import connect as websocket_connect
-from websockets.exceptions import ConnectionClosed
-from max_assistant.config import STT_WEBSOCKET_URL
+from websockets.asyncio.client import connect as websocket_connect, ClientConnection
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from websockets.protocol import State
+from max_assistant.config import STT_WEBSOCKET_URL, STT_POOL_SIZE, STT_PING_INTERVAL
+from max_assistant.utils.queue_utils import AsyncDeque
 
 logger = logging.getLogger(__name__)
 
 
+class STTConnectionPool:
+    """
+    Keeps a few prewarmed connections to the STT service, so a new client session
+    gets an open socket instead of paying for the handshake on its critical path.
+    Each connection is handed out to one session for its lifetime; the pool
+    replenishes itself in the background after every acquire.
+    """
+
+    def __init__(self, uri: str = STT_WEBSOCKET_URL, size: int = STT_POOL_SIZE):
+        self.uri = uri
+        self.size = size
+        self._idle: asyncio.Queue[ClientConnection] = asyncio.Queue()
+        self._fill_task: asyncio.Task | None = None
+
+    def start(self):
+        """Starts filling the pool in the background."""
+        self._replenish()
+
+    async def acquire(self) -> ClientConnection:
+        """Returns an open STT connection, prewarmed if one is available."""
+        while not self._idle.empty():
+            stt_ws = self._idle.get_nowait()
+            if stt_ws.state is State.OPEN:
+                self._replenish()
+                return stt_ws
+            # The idle connection was closed by the server; discard it.
+            await stt_ws.close()
+
+        self._replenish()
+        logger.info("STT pool empty, connecting directly.")
+        return await self._connect()
+
+    async def close(self):
+        """Stops replenishing and closes all idle connections."""
+        if self._fill_task:
+            self._fill_task.cancel()
+            await asyncio.gather(self._fill_task, return_exceptions=True)
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
+
+    async def _connect(self) -> ClientConnection:
+        return await websocket_connect(self.uri, ping_interval=STT_PING_INTERVAL)
+
+    def _replenish(self):
+        """Schedules a background refill, unless one is already running."""
+        if self._fill_task is None or self._fill_task.done():
+            self._fill_task = asyncio.create_task(self._fill())
+
+    async def _fill(self):
+        while self._idle.qsize() < self.size:
+            try:
+                self._idle.put_nowait(await self._connect())
+            except (OSError, InvalidHandshake, asyncio.TimeoutError) as e:
+                logger.warning(f"Could not prewarm STT connection: {e}")
+                return
+        logger.debug(f"STT pool filled with {self._idle.qsize()} connections.")
+
+
 class STTClient:
     """
     Manages a connection to the STT service and provides a transcript generator.
     """
 
-    def __init__(self, uri: str = STT_WEBSOCKET_URL, retry_delay: int = 5):
+    def __init__(
+            self,
+            uri: str = STT_WEBSOCKET_URL,
+            retry_delay: int = 5,
+            pool: STTConnectionPool | None = None
+    ):
         self.uri = uri
         self.retry_delay = retry_delay
+        self.pool = pool
+
+    async def _connect(self) -> ClientConnection:
+        """Takes a connection from the pool if there is one, otherwise connects directly."""
+        if self.pool:
+            return await self.pool.acquire()
+        return await websocket_connect(self.uri)
 
     @staticmethod
-    async def _forward_audio(audio_queue: asyncio.Queue, stt_ws, shutdown_event: asyncio.Event):
+    async def _forward_audio(audio_queue: AsyncDeque[bytes], stt_ws, shutdown_event: asyncio.Event):
         """
-        A helper task to forward audio from an asyncio Queue to the STT service.
+        A helper task to forward audio from the audio queue to the STT service.
         It stops when the shutdown_event is set.
         """
         try:
@@ -38,7 +110,7 @@ class STTClient:
         except Exception as e:
             logging.error(f"Error forwarding audio: {e}")
 
-    async def transcript_generator(self, audio_queue: asyncio.Queue, shutdown_event: asyncio.Event):
+    async def transcript_generator(self, audio_queue: AsyncDeque[bytes], shutdown_event: asyncio.Event):
         """
         Connects to the STT service and yields transcripts.
         This generator handles connection and reconnection logic, and gracefully
@@ -47,7 +119,7 @@ class STTClient:
         while not shutdown_event.is_set():
             forwarder_task = None
             try:
-                async with websocket_connect(self.uri) as stt_ws:
+                async with await self._connect() as stt_ws:
                     logger.info(f"Connected to STT service at {self.uri}.")
 
                     # Start the concurrent task to forward audio from the queue
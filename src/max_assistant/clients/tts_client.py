@@ -1,16 +1,65 @@
 import asyncio
-import wave
-from io import BytesIO
+import struct
 import logging
+from collections import OrderedDict
+from typing import AsyncIterator, List, Tuple
 
 from wyoming.client import AsyncClient
 from wyoming.tts import Synthesize, SynthesizeVoice
 from wyoming.audio import AudioStart, AudioChunk, AudioStop
 from wyoming.event import Event
 
+from max_assistant.utils.queue_utils import AsyncDeque
+
 logger = logging.getLogger(__name__)
 
 
+# Smallest PCM payload per streamed WAV segment (~0.75 s of 22.05 kHz 16-bit mono),
+# so the client isn't handed many tiny clips to play back to back.
+MIN_SEGMENT_BYTES = 32768
+
+# Number of recently synthesized utterances kept in memory, shared by all connections.
+# Short replies ("Good morning!", "Sorry, could you repeat that?") recur often.
+SPEECH_CACHE_SIZE = 256
+# Upper bound on the cached audio as a whole (~6 min of 22.05 kHz 16-bit mono), and on
+# a single utterance (~24 s); longer answers rarely recur word for word.
+SPEECH_CACHE_MAX_BYTES = 16 * 1024 * 1024
+SPEECH_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+_speech_cache: "OrderedDict[Tuple[str, str, int], List[bytes]]" = OrderedDict()
+_speech_cache_bytes = 0
+
+
+def _cache_speech(key: Tuple[str, str, int], segments: List[bytes]):
+    """Stores synthesized segments in the LRU cache, evicting the oldest entries past its bounds."""
+    global _speech_cache_bytes
+    size = sum(len(segment) for segment in segments)
+    if size > SPEECH_CACHE_MAX_ENTRY_BYTES or key in _speech_cache:
+        return
+    _speech_cache[key] = segments
+    _speech_cache_bytes += size
+    while len(_speech_cache) > SPEECH_CACHE_SIZE or _speech_cache_bytes > SPEECH_CACHE_MAX_BYTES:
+        _, evicted = _speech_cache.popitem(last=False)
+        _speech_cache_bytes -= sum(len(segment) for segment in evicted)
+
+
+def _wav_header(rate: int, width: int, channels: int, data_size: int) -> bytes:
+    """Builds the 44-byte header of a PCM WAV file holding data_size bytes of audio."""
+    block_align = width * channels
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, rate, rate * block_align, block_align, width * 8,
+        b"data", data_size,
+    )
+
+
+def _wav(start_event: AudioStart, audio_chunks: list[bytes]) -> bytes:
+    """Frames raw PCM chunks as a single WAV file, copying the audio only once."""
+    data_size = sum(len(chunk) for chunk in audio_chunks)
+    header = _wav_header(start_event.rate, start_event.width, start_event.channels, data_size)
+    return b"".join([header, *audio_chunks])
+
+
 class TTSClient:
     """Manages a persistent connection to a Wyoming TTS service."""
 
@@ -19,6 +68,8 @@ class TTSClient:
         self.retry_delay = retry_delay
         self._client: AsyncClient | None = None
         self._lock = asyncio.Lock()
+        # Set by _synthesize_pcm only once the server has sent AudioStop for the last request.
+        self._synthesis_complete = False
 
     async def connect(self):
         """Initiates connection to the TTS service."""
@@ -52,61 +103,138 @@ class TTSClient:
         Handles connection logic internally.
         """
         async with self._lock:
-            try:
-                await self._ensure_connected()
-                if not self._client:
-                    logging.error("TTS synthesis failed, client not connected.")
-                    return None
-
-                synthesize_event = Synthesize(
-                    text=text,
-                    voice=SynthesizeVoice(name=voice)
-                )
-                await self._client.write_event(synthesize_event.event())
-                logger.info(f"Sent synthesize request with voice: {voice} text: '{text}'")
-
-                wav_buffer = BytesIO()
-                wav_writer = None
-                audio_received = False
-
-                while True:
-                    event = await self._client.read_event()
-                    if event is None:
-                        logger.warning("TTS Connection closed by server. Will reconnect on next call.")
-                        await self.close()
-                        return None  # Current synthesis fails
-
-                    if AudioStart.is_type(event.type):
-                        start_event = AudioStart.from_event(event)
-                        wav_writer = wave.open(wav_buffer, "wb")
-                        wav_writer.setnchannels(start_event.channels)
-                        wav_writer.setsampwidth(start_event.width)
-                        wav_writer.setframerate(start_event.rate)
-                        logger.info(
-                            f"Audio stream started with params: rate={start_event.rate}, "
-                            f"width={start_event.width}, channels={start_event.channels}"
-                        )
-                    elif AudioChunk.is_type(event.type):
-                        chunk_event = AudioChunk.from_event(event)
-                        if wav_writer:
-                            wav_writer.writeframes(chunk_event.audio)
-                            audio_received = True
-                    elif AudioStop.is_type(event.type):
-                        logger.info("Audio stream finished.")
-                        break
-                    elif Event.is_type(event.type, "error"): # noinspection PyUnresolvedReferences
-                        logging.error(f"Received error from server: {event.data.get('text')}")
-                        break
-
-                if wav_writer:
-                    wav_writer.close()
-
-                return wav_buffer.getvalue() if audio_received else None
+            audio_chunks: list[bytes] = []
+            start_event = None
+            async for start_event, pcm in self._synthesize_pcm(text, voice):
+                audio_chunks.append(pcm)
 
-            except Exception as e:
-                logging.error(f"An unexpected error occurred in TTSClient: {e}", exc_info=True)
-                await self.close()
+            if not audio_chunks:
                 return None
+            return _wav(start_event, audio_chunks)
+
+    async def synthesize_speech_stream(
+            self,
+            text: str,
+            voice: str,
+            min_segment_bytes: int = MIN_SEGMENT_BYTES
+    ) -> AsyncIterator[bytes]:
+        """
+        Sends text for synthesis and yields the audio while it is being produced,
+        as self-contained WAV segments of at least min_segment_bytes of PCM (the
+        last one may be shorter). Playback can start before synthesis finishes.
+        Recently synthesized text is replayed from an in-memory LRU cache.
+        """
+        key = (text.strip(), voice, min_segment_bytes)
+        cached = _speech_cache.get(key)
+        if cached is not None:
+            _speech_cache.move_to_end(key)
+            logger.debug(f"Using cached speech for text: '{key[0]}'")
+            for segment in cached:
+                yield segment
+            return
+
+        # Synthesis runs in its own task and hands segments over through a queue,
+        # so the connection lock is held only while reading from the server, not
+        # while a slow consumer works through the audio.
+        queue: AsyncDeque[bytes | None] = AsyncDeque()
+        producer = asyncio.create_task(self._synthesize_segments(text, voice, min_segment_bytes, queue))
+        segments: List[bytes] = []
+        try:
+            while (segment := await queue.get()) is not None:
+                segments.append(segment)
+                yield segment
+        finally:
+            # Stop synthesizing if the consumer gave up early.
+            producer.cancel()
+
+        # Only cache audio the server finished; errors end the stream early.
+        if segments and await producer:
+            _cache_speech(key, segments)
+
+    async def _synthesize_segments(
+            self,
+            text: str,
+            voice: str,
+            min_segment_bytes: int,
+            queue: "AsyncDeque[bytes | None]"
+    ) -> bool:
+        """
+        Runs one synthesis within the lock, putting WAV segments of at least
+        min_segment_bytes of PCM on the queue, followed by None.
+        Returns True if the server finished the audio.
+        """
+        try:
+            async with self._lock:
+                pending: list[bytes] = []
+                pending_size = 0
+                start_event = None
+                async for start_event, pcm in self._synthesize_pcm(text, voice):
+                    pending.append(pcm)
+                    pending_size += len(pcm)
+                    if pending_size >= min_segment_bytes:
+                        queue.put_nowait(_wav(start_event, pending))
+                        pending, pending_size = [], 0
+
+                if pending:
+                    queue.put_nowait(_wav(start_event, pending))
+                return self._synthesis_complete
+        finally:
+            queue.put_nowait(None)
+
+    async def _synthesize_pcm(self, text: str, voice: str) -> AsyncIterator[Tuple[AudioStart, bytes]]:
+        """
+        Sends one synthesize request and yields each raw PCM chunk with the stream's
+        AudioStart parameters. Must be called within the lock. Errors end the
+        stream early and drop the connection, so the next call reconnects.
+        Sets self._synthesis_complete only if the stream ended with AudioStop.
+        """
+        self._synthesis_complete = False
+        try:
+            await self._ensure_connected()
+            if not self._client:
+                logging.error("TTS synthesis failed, client not connected.")
+                return
+
+            synthesize_event = Synthesize(
+                text=text,
+                voice=SynthesizeVoice(name=voice)
+            )
+            await self._client.write_event(synthesize_event.event())
+            logger.info(f"Sent synthesize request with voice: {voice} text: '{text}'")
+
+            start_event = None
+            while True:
+                event = await self._client.read_event()
+                if event is None:
+                    logger.warning("TTS Connection closed by server. Will reconnect on next call.")
+                    await self.close()
+                    return  # Current synthesis fails
+
+                if AudioStart.is_type(event.type):
+                    start_event = AudioStart.from_event(event)
+                    logger.info(
+                        f"Audio stream started with params: rate={start_event.rate}, "
+                        f"width={start_event.width}, channels={start_event.channels}"
+                    )
+                elif AudioChunk.is_type(event.type):
+                    if start_event:
+                        yield start_event, AudioChunk.from_event(event).audio
+                elif AudioStop.is_type(event.type):
+                    logger.info("Audio stream finished.")
+                    self._synthesis_complete = True
+                    return
+                elif Event.is_type(event.type, "error"): # noinspection PyUnresolvedReferences
+                    logging.error(f"Received error from server: {event.data.get('text')}")
+                    return
+
+        except asyncio.CancelledError:
+            # The rest of this response is still on its way; drop the connection
+            # so the next request doesn't read it.
+            await self.close()
+            raise
+        except Exception as e:
+            logging.error(f"An unexpected error occurred in TTSClient: {e}", exc_info=True)
+            await self.close()
 
     async def close(self):
         """Closes the connection to the TTS service."""
@@ -6,11 +6,6 @@ This module sets and manages configuration settings for Max-Assistant.
 import os
 import logging
 
-# --- Server Configuration for local development ---
-
-HOST = os.getenv("HOST", "127.0.0.1")
-PORT = int(os.getenv("PORT", "9000"))
-
 # --- Logging Configuration ---
 
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
@@ -21,27 +16,100 @@ log_level_str = os.getenv('LOG_LEVEL', 'info').upper()
 LOG_LEVEL = logging.getLevelName(log_level_str)
 
 # Validate LOG_LEVEL
-if not isinstance(LOG_LEVEL, int):
-    logging.warning(f"Invalid log level '{log_level_str}'. Defaulting to INFO.")
+invalid_log_level = not isinstance(LOG_LEVEL, int)
+if invalid_log_level:
     LOG_LEVEL = logging.INFO
 
-logging.basicConfig(level=LOG_LEVEL, format='XX %(asctime)s - %(levelname)s - %(message)s')
+# Configure logging before anything below logs, otherwise the first logging call
+# installs a default handler and turns this into a no-op.
+logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT, force=True)
+
+if invalid_log_level:
+    logging.warning(f"Invalid log level '{log_level_str}'. Defaulting to INFO.")
+
+
+def _env_int(name: str, default: int, minimum: int | None = None) -> int:
+    """
+    Reads an integer setting, falling back to the default (with a warning) if it
+    is invalid or below minimum.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        logging.warning(f"Invalid {name} '{value}'. Defaulting to {default}.")
+        return default
+    if minimum is not None and number < minimum:
+        logging.warning(f"{name} must be at least {minimum}, got {number}. Defaulting to {default}.")
+        return default
+    return number
+
+
+def _env_float(name: str, default: float, minimum: float | None = None) -> float:
+    """
+    Reads a numeric setting, falling back to the default (with a warning) if it
+    is invalid or below minimum.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        logging.warning(f"Invalid {name} '{value}'. Defaulting to {default}.")
+        return default
+    if minimum is not None and number < minimum:
+        logging.warning(f"{name} must be at least {minimum}, got {number}. Defaulting to {default}.")
+        return default
+    return number
+
+
+# --- Server Configuration for local development ---
+
+HOST = os.getenv("HOST", "127.0.0.1")
+PORT = _env_int("PORT", 9000, minimum=0)
 
 # --- Application Configuration ---
 
 TTS_VOICE = os.environ.get("TTS_VOICE", "en_US-hfc_female-medium")
 DEFAULT_USERNAME = os.getenv("DEFAULT_USERNAME", "User")
-SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", "5.0"))
-QUEUE_GET_TIMEOUT = float(os.getenv("QUEUE_GET_TIMEOUT", "1.0"))
+SHUTDOWN_TIMEOUT = _env_float("SHUTDOWN_TIMEOUT", 5.0, minimum=0.0)
+QUEUE_GET_TIMEOUT = _env_float("QUEUE_GET_TIMEOUT", 1.0, minimum=0.1)
+# Per-connection queue bounds. A full audio queue drops its oldest frame;
+# a full output queue blocks its producer (backpressure). 0 would make them unbounded.
+AUDIO_QUEUE_MAXSIZE = _env_int("AUDIO_QUEUE_MAXSIZE", 64, minimum=1)    # ~1-2 s of audio frames
+OUTPUT_QUEUE_MAXSIZE = _env_int("OUTPUT_QUEUE_MAXSIZE", 32, minimum=1)
 
 # --- LLM and Prompt Initialization ---
 OLLAMA_MODEL_NAME = os.getenv("OLLAMA_MODEL_NAME", "llama3")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+# How long Ollama keeps the model (and its prompt KV cache) loaded after a request.
+# Accepts seconds (negative keeps it loaded indefinitely) or a duration string e.g. "30m".
+keep_alive_str = os.getenv("OLLAMA_KEEP_ALIVE", "-1")
+OLLAMA_KEEP_ALIVE = int(keep_alive_str) if keep_alive_str.lstrip("-").isdigit() else keep_alive_str
+# Seconds between background requests that keep the model resident (0 disables).
+OLLAMA_KEEP_ALIVE_INTERVAL = _env_float("OLLAMA_KEEP_ALIVE_INTERVAL", 1500.0, minimum=0.0)
+# Seconds the startup warm-up may take before clients are let through anyway.
+OLLAMA_WARMUP_TIMEOUT = _env_float("OLLAMA_WARMUP_TIMEOUT", 120.0, minimum=0.0)
+# Context window in tokens (0 uses the model's default). It must hold the system
+# prompt, the pruned history and the reply; if it overflows, Ollama truncates the
+# start of the prompt, which also discards the cached prompt prefix.
+OLLAMA_NUM_CTX = _env_int("OLLAMA_NUM_CTX", 0, minimum=0)
+# Concurrent sessions' LLM requests are batched by the Ollama server; set
+# OLLAMA_NUM_PARALLEL there to at least LLM_MAX_PARALLEL, the number of idle
+# connections kept open to it.
+LLM_MAX_PARALLEL = _env_int("LLM_MAX_PARALLEL", 8, minimum=1)
 
 # --- Neo4j Configuration ---
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USERNAME = os.getenv("NEO4J_USERNAME", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+NEO4J_MAX_POOL_SIZE = _env_int("NEO4J_MAX_POOL_SIZE", 50, minimum=1)
+NEO4J_ACQUISITION_TIMEOUT = _env_float("NEO4J_ACQUISITION_TIMEOUT", 5.0, minimum=0.0)
+# Seconds to cache day-scoped schedule reads (appointments, routines, activities).
+SCHEDULE_CACHE_TTL = _env_float("SCHEDULE_CACHE_TTL", 300.0, minimum=0.0)
 
 # --- Gmail Configuration ---
 GOOGLE_SENDER_EMAIL = os.getenv("GOOGLE_SENDER_EMAIL", "")
@@ -49,12 +117,12 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
 logging.info(f"GOOGLE_SENDER_EMAIL: {GOOGLE_SENDER_EMAIL}")
 
-# Validate MESSAGE_PRUNING_LIMIT
-limit_str = (os.getenv("MESSAGE_PRUNING_LIMIT", 10))
-MESSAGE_PRUNING_LIMIT = int(limit_str)
-if not isinstance(MESSAGE_PRUNING_LIMIT, int):
-    MESSAGE_PRUNING_LIMIT = 10
-    logging.warning(f"Invalid Message Pruning Limit '{limit_str}'. Defaulting to {MESSAGE_PRUNING_LIMIT}")
+# Messages kept in the conversation history. A turn with a tool call adds four
+# (question, tool call, tool result, answer), so fewer would cut into the current turn.
+MESSAGE_PRUNING_LIMIT = _env_int("MESSAGE_PRUNING_LIMIT", 10, minimum=4)
 
 # --- STT ---
-STT_WEBSOCKET_URL = os.environ.get("STT_WEBSOCKET_URL", "ws://stt/ws")
\ No newline at end of file
+STT_WEBSOCKET_URL = os.environ.get("STT_WEBSOCKET_URL", "ws://stt/ws")
+# Number of prewarmed STT connections kept ready for new client sessions.
+STT_POOL_SIZE = _env_int("STT_POOL_SIZE", 2, minimum=1)
+STT_PING_INTERVAL = _env_float("STT_PING_INTERVAL", 20.0, minimum=1.0)
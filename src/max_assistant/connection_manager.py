@@ -14,39 +14,85 @@ Classes:
 
 """
 import asyncio
-import json
 import logging
-from asyncio import Queue
-from typing import List
+import time
+import orjson
+from typing import Dict, List
 
 from fastapi import WebSocket, WebSocketDisconnect
+from starlette.types import Message
 
 from max_assistant.agent.agent import Agent
-from max_assistant.config import QUEUE_GET_TIMEOUT
+from max_assistant.config import QUEUE_GET_TIMEOUT, AUDIO_QUEUE_MAXSIZE, OUTPUT_QUEUE_MAXSIZE
 from max_assistant.clients.stt_client import STTClient
 from max_assistant.clients.tts_client import TTSClient
+from max_assistant.utils.queue_utils import AsyncDeque
 from .app_services import AppServices
 
 logger = logging.getLogger(__name__)
 
+# Most queued messages the writer sends after each wake-up before awaiting again.
+WRITER_DRAIN_LIMIT = 16
+
+# Seconds after a turn's speech ends during which the same transcript again is treated
+# as an STT repeat (e.g. re-sent while the user paused) rather than a new request.
+DUPLICATE_TRANSCRIPT_WINDOW = 2.0
+
+# Pre-encoded framing of an assistant message, {"data": <text>, "source": "assistant"},
+# so each reply only serializes its text instead of building and encoding a dict.
+_ASSISTANT_PAYLOAD_PREFIX = b'{"data":'
+_ASSISTANT_PAYLOAD_SUFFIX = b',"source":"assistant"}'
+
+
+def _assistant_payload(text: str) -> str:
+    """Returns the JSON message that carries an assistant reply to the client."""
+    return (_ASSISTANT_PAYLOAD_PREFIX + orjson.dumps(text) + _ASSISTANT_PAYLOAD_SUFFIX).decode()
+
+
+# Sent while the LLM is still loading. The text is fixed, so its payload is
+# serialized once and its audio is synthesized once per voice.
+WAITING_MESSAGE = "I am just getting set up, I'll be with you in a moment."
+WAITING_PAYLOAD = _assistant_payload(WAITING_MESSAGE)
+_waiting_audio_cache: Dict[str, bytes] = {}
+
+# An STT message without the data key, or containing any empty marker, carries no transcript.
+_TRANSCRIPT_KEY = '"data"'
+_EMPTY_TRANSCRIPT_MARKERS = ('"data":""', '"data": ""', '"data":" "', '"data": " "')
+
+
+class _ConnectionClosed(Exception):
+    """Raised inside the connection's task group to cancel its tasks once it is closing."""
+
 
 class ConnectionManager:
-    """Manages the state and logic for a single client WebSocket connection."""
+    """
+    Manages the state and logic for a single client WebSocket connection.
+
+    For each voice turn the client receives, in this order: the STT transcript
+    message, the reply's audio as WAV segments while it is being synthesized,
+    and the assistant text message once the whole reply has been generated.
+    Audio can therefore arrive before the text it belongs to, and a turn's
+    remaining audio may still arrive after its text.
+    """
 
     def __init__(self, app_services: AppServices, websocket: WebSocket):
         self.ws = websocket
         self.agent = Agent(app_services.reasoning_engine, app_services.user_info)
-        self.stt_client = STTClient()
+        self.stt_client = STTClient(pool=app_services.stt_pool)
         self.tts_client = TTSClient()
         self.app_services = app_services
 
-        # Queues for decoupling producer/consumer tasks
-        self.binary_input_queue = Queue()
-        self.text_input_queue = Queue()
-        self.client_output_queue = Queue()
+        # Queues for decoupling producer/consumer tasks, each has one consumer.
+        # The audio and output queues are bounded so a stalled consumer can't
+        # make them grow without limit: a full audio queue drops its oldest
+        # frame, while a full output queue blocks its producer (backpressure).
+        self.binary_input_queue: AsyncDeque[bytes] = AsyncDeque(maxsize=AUDIO_QUEUE_MAXSIZE)
+        self.text_input_queue: AsyncDeque[str] = AsyncDeque()
+        self.client_output_queue: AsyncDeque[str | bytes] = AsyncDeque(maxsize=OUTPUT_QUEUE_MAXSIZE)
 
         self._shutdown_event = asyncio.Event()
-        self._tasks: List[asyncio.Task] = []
+        # When the last turn's speech finished, see _speak.
+        self._last_speech_end = 0.0
 
     async def handle_connection(self):
         """
@@ -56,26 +102,29 @@ class ConnectionManager:
         """
         logger.info("Handling new client connection.")
 
-        self._tasks = [
-            asyncio.create_task(self._client_reader()),
-            asyncio.create_task(self._client_writer()),
-            asyncio.create_task(self._run_main_logic()),
-        ]
-
         try:
-            # Wait for any of the main tasks to complete. This indicates the
-            # connection should be closed, either normally or due to an error.
-            done, pending = await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
-            for task in done:
-                # Log any exceptions from the completed task
-                if task.exception():
-                    logger.error(f"A connection task failed: {task.exception()}", exc_info=True)
+            # Any task ending (normally or by an error) closes the connection:
+            # the task group cancels the remaining tasks and waits for them.
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(self._client_reader())
+                task_group.create_task(self._client_writer())
+                task_group.create_task(self._run_main_logic())
+                task_group.create_task(self._close_on_shutdown())
+        except* _ConnectionClosed:
+            pass
+        except* Exception as error_group:
+            for error in error_group.exceptions:
+                logger.error("A connection task failed: %s", error, exc_info=error)
         finally:
             self._shutdown_event.set()
-            await self._cancel_tasks(self._tasks)
             await self.tts_client.close()
             logger.info("Connection handler for a client finished.")
 
+    async def _close_on_shutdown(self):
+        """Ends the connection's task group once any task has signalled shutdown."""
+        await self._shutdown_event.wait()
+        raise _ConnectionClosed
+
     async def _run_main_logic(self):
         """
         Coordinates the primary logic, including LLM warmup, and runs the
@@ -87,20 +136,16 @@ class ConnectionManager:
             self._handle_llm_warmup()
         )
 
-        # Once services are ready, start the core processing loops.
-        processing_tasks = [
-            asyncio.create_task(self._agent_loop()),
-            asyncio.create_task(self._text_input_handler_loop())
-        ]
-        self._tasks.extend(processing_tasks)
-
+        # Once services are ready, run the core processing loops. If either
+        # fails, the task group cancels the other.
         try:
-            await asyncio.gather(*processing_tasks)
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(self._agent_loop())
+                task_group.create_task(self._text_input_handler_loop())
         except asyncio.CancelledError:
             logger.info("Main logic task cancelled.")
+            raise
         finally:
-            # Propagate cancellation to sub-tasks.
-            await self._cancel_tasks(processing_tasks)
             logger.info("Main logic processing has stopped.")
 
     async def _handle_llm_warmup(self):
@@ -109,14 +154,21 @@ class ConnectionManager:
         """
         if not self.app_services.llm_ready_event.is_set():
             logger.info("LLM not ready. Sending a waiting message to the client.")
-            response_text = "I am just getting set up, I'll be with you in a moment."
+            voice = self.agent.get_voice()
+            output_audio = _waiting_audio_cache.get(voice)
 
-            response_payload = {"data": response_text, "source": "assistant"}
-            await self.client_output_queue.put(json.dumps(response_payload))
+            # Start synthesis first so it runs while the text is queued and sent.
+            tts_task = None
+            if output_audio is None:
+                tts_task = asyncio.create_task(
+                    self.tts_client.synthesize_speech(WAITING_MESSAGE, voice)
+                )
+            await self.client_output_queue.put(WAITING_PAYLOAD)
 
-            output_audio = await self.tts_client.synthesize_speech(
-                response_text, self.agent.get_voice()
-            )
+            if tts_task:
+                output_audio = await tts_task
+                if output_audio:
+                    _waiting_audio_cache[voice] = output_audio
             if output_audio:
                 logger.info("Sending audio for waiting message.")
                 await self.client_output_queue.put(output_audio)
@@ -129,21 +181,32 @@ class ConnectionManager:
         """Reads messages from the WebSocket and puts them into the appropriate queues."""
         try:
             while not self._shutdown_event.is_set():
-                message = await self.ws.receive()
-                if message.get("type") == "websocket.disconnect":
+                message: Message = await self.ws.receive()
+                # Audio frames are the hot path, so check for bytes first and
+                # look each key up only once.
+                data: bytes | None = message.get("bytes")
+                if data is not None:
+                    if self.binary_input_queue.full():
+                        # STT has fallen behind; drop the stalest frame rather
+                        # than stop reading (and miss text or a disconnect).
+                        self.binary_input_queue.get_nowait()
+                        logger.debug("Audio queue full, dropped the oldest frame.")
+                    self.binary_input_queue.put_nowait(data)
+                    continue
+                text: str | None = message.get("text")
+                if text is not None:
+                    await self.text_input_queue.put(text)
+                elif message["type"] == "websocket.disconnect":
                     logger.info("Client initiated disconnect.")
                     break
-                if 'text' in message:
-                    await self.text_input_queue.put(message['text'])
-                elif 'bytes' in message:
-                    await self.binary_input_queue.put(message['bytes'])
         except WebSocketDisconnect:
             logger.info("Client disconnected (reader).")
+        except RuntimeError as e:
+            # Starlette raises RuntimeError when the socket is no longer usable.
+            logger.error("WS reader error: %s", e)
         except asyncio.CancelledError:
             logger.info("Client reader task cancelled.")
-        except Exception as e:
-            # Catching unexpected errors for logging purposes.
-            logging.error(f"Unexpected WS reader error: {e}", exc_info=True)
+            raise
         finally:
             self._shutdown_event.set()
 
@@ -151,81 +214,160 @@ class ConnectionManager:
         """Gets messages from the output queue and sends them to the WebSocket."""
         try:
             while not self._shutdown_event.is_set():
-                message = await self.client_output_queue.get()
-                if isinstance(message, bytes):
-                    await self.ws.send_bytes(message)
-                else:
-                    await self.ws.send_text(str(message))
+                message: str | bytes = await self.client_output_queue.get()
+                await self._send_message(message)
+                # Send anything else that is already queued back-to-back,
+                # capped so one burst can't hold the writer for too long.
+                for _ in range(WRITER_DRAIN_LIMIT):
+                    try:
+                        message = self.client_output_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    await self._send_message(message)
         except WebSocketDisconnect:
             logger.info("Client disconnected (writer).")
+        except RuntimeError as e:
+            # Starlette raises RuntimeError when the socket is no longer usable.
+            logger.error("WS writer error: %s", e)
         except asyncio.CancelledError:
             logger.info("Client writer task cancelled.")
-        except Exception as e:
-            logging.error(f"Unexpected WS writer error: {e}", exc_info=True)
+            raise
         finally:
             self._shutdown_event.set()
 
+    async def _send_message(self, message: str | bytes):
+        """Sends one queued message, as a binary frame for audio and a text frame otherwise."""
+        if isinstance(message, bytes):
+            await self.ws.send_bytes(message)
+        else:
+            await self.ws.send_text(message)
+
     async def _text_input_handler_loop(self):
         """Processes text input from the client and updates the conversation state."""
         try:
             while not self._shutdown_event.is_set():
                 try:
-                    text_data = await asyncio.wait_for(self.text_input_queue.get(), timeout=QUEUE_GET_TIMEOUT)
-                    logger.info(f"TEXT_HANDLER: Received text from client: {text_data}")
-                    client_dict = json.loads(text_data)
-                    if "username" in client_dict:
-                        logger.info(f"username sent: {client_dict['username']}")
-                    if "voice" in client_dict:
-                        self.agent.set_voice(client_dict["voice"])
+                    batch = [await asyncio.wait_for(self.text_input_queue.get(), timeout=QUEUE_GET_TIMEOUT)]
                 except asyncio.TimeoutError:
                     # No text received, continue waiting.
                     continue
-                except (json.JSONDecodeError, TypeError) as e:
-                    logging.warning(f"Could not parse text message from client: {e}")
+
+                # Take everything else already queued; only the latest value of
+                # each setting in the batch needs to be applied.
+                while not self.text_input_queue.empty():
+                    batch.append(self.text_input_queue.get_nowait())
+
+                voice = None
+                for text_data in batch:
+                    logger.info("TEXT_HANDLER: Received text from client: %s", text_data)
+                    try:
+                        client_dict = orjson.loads(text_data)
+                        if "username" in client_dict:
+                            logger.info("username sent: %s", client_dict["username"])
+                        if "voice" in client_dict:
+                            voice = client_dict["voice"]
+                    except (orjson.JSONDecodeError, TypeError) as e:
+                        logger.warning("Could not parse text message from client: %s", e)
+
+                if voice is not None:
+                    self.agent.set_voice(voice)
         except asyncio.CancelledError:
-            pass  # Task was cancelled, exit gracefully.
-        except Exception as e:
-            logging.error(f"Error in text input handler: {e}", exc_info=True)
-            self._shutdown_event.set()
+            logger.info("Text input handler task cancelled.")
+            raise
         finally:
             logger.info("Text input handler loop has stopped.")
 
     async def _agent_loop(self):
         """Handles STT, reasoning, and TTS for the connection."""
+        last_transcript = ""
+        speak_task: asyncio.Task | None = None
         try:
             async for stt_message_str in self.stt_client.transcript_generator(
                 self.binary_input_queue, self._shutdown_event
             ):
+                # Skip empty or transcript-less messages (e.g. silence) without parsing them.
+                if (
+                    not stt_message_str
+                    or _TRANSCRIPT_KEY not in stt_message_str
+                    or any(marker in stt_message_str for marker in _EMPTY_TRANSCRIPT_MARKERS)
+                ):
+                    continue
+                if stt_message_str[0] != "{":
+                    # Not a JSON object; skip it without running the parser.
+                    logger.warning("Ignoring malformed STT message: %s", stt_message_str)
+                    continue
                 try:
-                    stt_response = json.loads(stt_message_str)
+                    stt_response = orjson.loads(stt_message_str)
                     transcript = stt_response.get("data", "").strip()
                     if not transcript:
                         continue
+                    if (
+                        transcript == last_transcript
+                        and speak_task is not None
+                        and (
+                            not speak_task.done()
+                            or time.monotonic() - self._last_speech_end < DUPLICATE_TRANSCRIPT_WINDOW
+                        )
+                    ):
+                        logger.debug("Skipping repeated transcript: %s", transcript)
+                        continue
+                    last_transcript = transcript
 
                     await self.client_output_queue.put(stt_message_str)
 
-                    llm_response = await self.agent.ainvoke(transcript)
-
-                    response_payload = {"data": llm_response, "source": "assistant"}
-                    await self.client_output_queue.put(json.dumps(response_payload))
+                    # Synthesize each sentence as soon as the LLM produces it, so
+                    # audio playback starts before the full response is generated.
+                    # The loop doesn't wait for the speech to finish: the next
+                    # transcript is handled right away, and its speech starts
+                    # after this turn's so the audio stays in order.
+                    sentences: AsyncDeque[str | None] = AsyncDeque()
+                    speak_task = asyncio.create_task(self._speak(sentences, after=speak_task))
+                    try:
+                        async for sentence in self.agent.astream(transcript):
+                            sentences.put_nowait(sentence)
+                    finally:
+                        sentences.put_nowait(None)
 
-                    output_audio = await self.tts_client.synthesize_speech(
-                        llm_response, self.agent.get_voice()
-                    )
-                    if output_audio:
-                        logger.info("Sending audio Response.")
-                        await self.client_output_queue.put(output_audio)
+                    # The full text is only known now, after its first audio has been sent.
+                    llm_response = self.agent.get_last_response()
+                    await self.client_output_queue.put(_assistant_payload(llm_response))
 
-                except (json.JSONDecodeError, AttributeError) as e:
-                    logging.warning(f"Could not parse STT message: {stt_message_str} ({e})")
+                except (orjson.JSONDecodeError, AttributeError) as e:
+                    logger.warning("Could not parse STT message: %s (%s)", stt_message_str, e)
         except asyncio.CancelledError:
-            pass  # Task was cancelled.
-        except Exception as e:
-            logging.error(f"Error in agent loop: {e}", exc_info=True)
-            self._shutdown_event.set()
+            logger.info("Agent loop task cancelled.")
+            raise
         finally:
+            # Any other error propagates to the connection supervisor, which logs
+            # it and closes the connection.
+            self._shutdown_event.set()
+            # Cancelling the latest speech also cancels the earlier turns it waits on.
+            if speak_task:
+                await self._cancel_tasks([speak_task])
             logger.info("Agent loop has stopped.")
 
+    async def _speak(self, sentences: AsyncDeque[str | None], after: asyncio.Task | None = None):
+        """
+        Synthesizes sentences in order until a None marks the end of the response,
+        queueing each audio segment for the client as soon as the TTS produces it.
+        If after is given, waits for that (previous turn's) speech to finish first;
+        a failure there is logged and does not stop this turn from being spoken.
+        Cancelling this task also cancels the earlier turns it waits on.
+        """
+        if after is not None:
+            try:
+                await after
+            except Exception as e:
+                logger.warning("Previous speech failed: %s", e, exc_info=e)
+        voice = self.agent.get_voice()
+        try:
+            while (sentence := await sentences.get()) is not None:
+                async for segment in self.tts_client.synthesize_speech_stream(sentence, voice):
+                    logger.debug("Sending audio segment.")
+                    await self.client_output_queue.put(segment)
+        finally:
+            self._last_speech_end = time.monotonic()
+
     async def _cancel_tasks(self, tasks: List[asyncio.Task]):
         """
         Gracefully cancels a list of asyncio tasks.
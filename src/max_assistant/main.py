@@ -1,14 +1,17 @@
+import atexit
 import json
 import os
+import queue
 import uvicorn
 import asyncio
 import logging
 import logging.config
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
 
 from max_assistant.config import (
-    PORT, HOST,
+    PORT, HOST, SHUTDOWN_TIMEOUT,
 )
 
 from max_assistant.app_services import AppServices
@@ -16,8 +19,6 @@ from max_assistant.connection_manager import ConnectionManager
 
 logger = logging.getLogger(__name__)
 
-app_services: AppServices = None
-
 
 def setup_logging(config_path='log_config.json'):
     """Loads logging configuration from a JSON file."""
@@ -42,20 +43,52 @@ def setup_logging(config_path='log_config.json'):
         print(f"An error occurred during logging setup: {e}")
         logging.basicConfig(level=logging.INFO)
 
+    # Flush queued records at exit, after the server's own shutdown logging.
+    for listener in use_queue_handlers():
+        atexit.register(listener.stop)
+
+
+def use_queue_handlers() -> list[QueueListener]:
+    """
+    Swaps every configured handler for a QueueHandler, so logging calls only
+    enqueue the record and the stream writes happen on background listener
+    threads instead of blocking the event loop. Returns the started listeners.
+    """
+    loggers = [logging.getLogger()] + [
+        lg for lg in logging.Logger.manager.loggerDict.values() if isinstance(lg, logging.Logger)
+    ]
+    queue_handlers: dict[logging.Handler, QueueHandler] = {}
+    for lg in loggers:
+        for i, handler in enumerate(lg.handlers):
+            if isinstance(handler, QueueHandler):
+                continue
+            if handler not in queue_handlers:
+                queue_handlers[handler] = QueueHandler(queue.SimpleQueue())
+            lg.handlers[i] = queue_handlers[handler]
+
+    listeners = [
+        QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+        for handler, queue_handler in queue_handlers.items()
+    ]
+    for listener in listeners:
+        listener.start()
+    return listeners
+
 
 setup_logging()
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(fastapi_app: FastAPI):
     """
     Manages the application's startup logic.
+    The services are created once and shared by all connections via app.state.
     """
-    global app_services
     logger.info("Application startup...")
 
     try:
-        app_services = await AppServices.create()
+        app_services = await AppServices.create(enable_stt_pool=True)
+        fastapi_app.state.app_services = app_services
         logger.info("Application services successfully initialized.")
 
     except Exception as e:
@@ -67,9 +100,11 @@ async def lifespan(_: FastAPI):
     yield
 
     # Shutdown logic: This code runs after the server is stopped
-    logger.info("Closing Neo4j client connection...")
-    if app_services and app_services.db_client:
-        await app_services.db_client.close()
+    if app_services:
+        try:
+            await asyncio.wait_for(app_services.close(), timeout=SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Closing application services timed out after {SHUTDOWN_TIMEOUT} seconds.")
     logger.info("Application shutdown complete.")
 
 
@@ -89,8 +124,7 @@ async def websocket_endpoint(client_ws: WebSocket):
     await client_ws.accept()
     logger.info("Client connected.")
 
-    global app_services
-
+    app_services: AppServices | None = getattr(client_ws.app.state, "app_services", None)
     if not app_services or not app_services.reasoning_engine:
         logger.error("Server not fully initialized: missing services.")
         await client_ws.close(code=1011, reason="Server error: Not initialized.")
@@ -110,4 +144,5 @@ async def websocket_endpoint(client_ws: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=HOST, port=PORT)
+    # uvloop's libuv-based event loop cuts per-await overhead on the websocket paths.
+    uvicorn.run(app, host=HOST, port=PORT, loop="uvloop", http="httptools", ws="websockets")
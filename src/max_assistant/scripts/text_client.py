@@ -8,6 +8,13 @@ import logging
 import datetime
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # libuv-based event loop, lower per-await overhead than the default loop.
+    from uvloop import run as run_event_loop
+except ImportError:
+    from asyncio import run as run_event_loop
 
 
 # Load environment variables for text client env
@@ -22,7 +29,7 @@ from max_assistant.app_services import AppServices
 from max_assistant.agent.agent import Agent
 
 
-async def main(log_path=None):
+async def main(log_path=None, stream=True):
     """
     A simple text-based client to interact with the Agent.
     """
@@ -57,21 +64,35 @@ async def main(log_path=None):
 
     print("Agent is ready. Type 'exit' to quit.")
 
+    # A single long-lived thread serves every blocking input() call.
+    loop = asyncio.get_running_loop()
+    stdin_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stdin")
+
     while True:
         try:
-            user_input = await asyncio.to_thread(input, "You: ")
+            user_input = await loop.run_in_executor(stdin_executor, input, "You: ")
             if user_input.lower() == 'exit':
                 break
 
-            response = await agent.ainvoke(user_input)
-            print(f"Agent: {response}")
+            if not stream:
+                print(f"Agent: {await agent.ainvoke_text(user_input)}")
+                continue
+
+            # Print each sentence as soon as it is generated.
+            print("Agent:", end="", flush=True)
+            async for sentence in agent.astream(user_input):
+                print(f" {sentence}", end="", flush=True)
+            print()
 
         except (KeyboardInterrupt, EOFError):
             break
 
+    stdin_executor.shutdown(wait=False)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="A command-line client for interacting with the text-based agent.")
     parser.add_argument("--log-path", type=str, help="Directory to store log files.")
+    parser.add_argument("--no-stream", action="store_true", help="Print each response only once it is complete.")
     args = parser.parse_args()
-    asyncio.run(main(log_path=args.log_path))
+    run_event_loop(main(log_path=args.log_path, stream=not args.no_stream))
@@ -102,8 +102,9 @@ class GeneralQueryTools(BaseToolProvider):
             logger.info(f"Generated Cypher: {cypher_query}")
 
             # 3. Execute the query
-            # We use params={} as the LLM is instructed to embed values
-            result = await self.db_client.execute_query(cypher_query, params={})
+            # We use params={} as the LLM is instructed to embed values.
+            # Generated queries must be read-only, so route them as reads.
+            result = await self.db_client.execute_query(cypher_query, params={}, read_only=True)
 
             # 4. Return the raw JSON string
             return json.dumps(result, indent=2)
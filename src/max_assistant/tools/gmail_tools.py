@@ -67,7 +67,7 @@ class GmailTools(BaseToolProvider):
         """
 
         check_query = "MATCH (u:User) RETURN u.gmailRefreshToken AS token"
-        result = await self.db_client.execute_query(check_query, {})
+        result = await self.db_client.execute_query(check_query, {}, read_only=True)
         if "data" in result and result["data"] and result["data"][0].get("token"):
             logger.warning(
                 "Gmail refresh token already exists for the User in Neo4j. "
@@ -131,7 +131,7 @@ class GmailTools(BaseToolProvider):
                u.gmailAccessToken AS access_token,
                u.gmailTokenExpiry AS expiry
         """
-        result = await self.db_client.execute_query(get_query, {})
+        result = await self.db_client.execute_query(get_query, {}, read_only=True)
 
         if "error" in result:
             logger.error(f"Neo4j error: {result['error']}")
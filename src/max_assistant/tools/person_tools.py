@@ -5,11 +5,11 @@ Defines LangGraph tools for finding people and understanding relationships.
 """
 import json
 import logging
-from typing import Optional, Type, Dict, Any
+from typing import Optional, Dict, Any
 
 from langchain_ollama import ChatOllama
 from langchain_core.tools import StructuredTool
-from pydantic import ValidationError, BaseModel
+from pydantic import ValidationError
 
 from max_assistant.clients.neo4j_client import Neo4jClient
 from max_assistant.models.person_models import (
@@ -38,45 +38,6 @@ class PersonTools(BaseToolProvider):
         super().__init__(db_client, llm)
         logger.info("PersonTools initialized with a Neo4j client.")
 
-    async def _query_and_validate_nodes(
-            self,
-            query: str,
-            params: dict,
-            model_class: Type[BaseModel],
-            result_key: str
-    ) -> str:
-        """
-        Private helper to execute a query, validate results against a
-        Pydantic model, and return a JSON string.
-        """
-        logger.debug(f"Executing query with params: {params} for model: {model_class.__name__}")
-        result = await self.db_client.execute_query(query, params)
-
-        if "error" in result:
-            return json.dumps(result)
-
-        try:
-            raw_nodes = [item[result_key] for item in result.get("data", [])]
-            validated_nodes = [model_class.model_validate(node) for node in raw_nodes]
-            return json.dumps(
-                [node.model_dump(mode='json') for node in validated_nodes],
-                indent=2,
-                default=str
-            )
-        except ValidationError as e:
-            logger.error(f"Validation error for {model_class.__name__}: {e.errors()}")
-            return json.dumps(
-                {"error": "Data validation failed", "details": e.errors()},
-                default=str
-            )
-        except KeyError:
-            logger.error(f"Validation: Unexpected data structure from DB. Expected key '{result_key}'.")
-            return json.dumps({"error": "Data parsing failed",
-                               "details": f"Unexpected data structure from DB. Missing key: {result_key}"})
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return json.dumps({"error": "Data parsing failed", "details": str(e)})
-
     # --- NEW: REUSABLE RELATIONSHIP HELPERS ---
 
     def _get_relationship_description(self, path_data: Dict[str, Any]) -> str:
@@ -131,7 +92,7 @@ class PersonTools(BaseToolProvider):
             ORDER BY length(path) ASC
             LIMIT 1
             """
-        result = await self.db_client.execute_query(family_query, params)
+        result = await self.db_client.execute_query(family_query, params, read_only=True)
         if "error" in result:
             logger.warning(f"Family path query failed: {result['error']}")
             return None
@@ -147,7 +108,7 @@ class PersonTools(BaseToolProvider):
             ORDER BY length(path) ASC
             LIMIT 1
             """
-        result = await self.db_client.execute_query(other_query, params)
+        result = await self.db_client.execute_query(other_query, params, read_only=True)
         if "error" in result:
             logger.warning(f"Other path query failed: {result['error']}")
             return None
@@ -188,7 +149,7 @@ class PersonTools(BaseToolProvider):
             "last_name": last_name.lower() if last_name else None
         }
 
-        result = await self.db_client.execute_query(query, params)
+        result = await self.db_client.execute_query(query, params, read_only=True)
 
         if "error" in result:
             return json.dumps(result)
@@ -276,7 +237,7 @@ class PersonTools(BaseToolProvider):
             "first_name": first_name.lower(),
             "last_name": last_name.lower()
         }
-        find_result = await self.db_client.execute_query(find_query, params)
+        find_result = await self.db_client.execute_query(find_query, params, read_only=True)
 
         if "error" in find_result:
             return json.dumps(find_result)
@@ -317,7 +278,7 @@ class PersonTools(BaseToolProvider):
             RETURN properties(u) AS user, properties(l) AS location
             LIMIT 1
             """
-        result = await self.db_client.execute_query(query, {})
+        result = await self.db_client.execute_query(query, {}, read_only=True)
 
         if "error" in result:
             return result
@@ -8,11 +8,13 @@ The `ToolRegistry` class orchestrates the overall lifecycle of tool providers,
 including registration, dependency injection into providers' constructors, and
 access to all tools provided by the registered providers.
 """
+import json
 import logging
 from typing import List, Type
 
 from langchain_core.tools import BaseTool
 from langchain_ollama import ChatOllama
+from pydantic import BaseModel, ValidationError
 
 from max_assistant.clients.neo4j_client import Neo4jClient
 
@@ -31,6 +33,45 @@ class BaseToolProvider:
     def get_tools(self) -> List[BaseTool]:
         raise NotImplementedError
 
+    async def _query_and_validate_nodes(
+            self,
+            query: str,
+            params: dict,
+            model_class: Type[BaseModel],
+            result_key: str
+    ) -> str:
+        """
+        Shared helper to execute a read query, validate results against a
+        Pydantic model, and return a JSON string.
+        """
+        logger.debug(f"Executing query with params: {params} for model: {model_class.__name__}")
+        result = await self.db_client.execute_query(query, params, read_only=True)
+
+        if "error" in result:
+            return json.dumps(result)
+
+        try:
+            raw_nodes = [item[result_key] for item in result.get("data", [])]
+            validated_nodes = [model_class.model_validate(node) for node in raw_nodes]
+            return json.dumps(
+                [node.model_dump(mode='json') for node in validated_nodes],
+                indent=2,
+                default=str
+            )
+        except ValidationError as e:
+            logger.error(f"Validation error for {model_class.__name__}: {e.errors()}")
+            return json.dumps(
+                {"error": "Data validation failed", "details": e.errors()},
+                default=str
+            )
+        except KeyError:
+            logger.error(f"Validation: Unexpected data structure from DB. Expected key '{result_key}'.")
+            return json.dumps({"error": "Data parsing failed",
+                               "details": f"Unexpected data structure from DB. Missing key: {result_key}"})
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return json.dumps({"error": "Data parsing failed", "details": str(e)})
+
 
 class ToolRegistry:
     """
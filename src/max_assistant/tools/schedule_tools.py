@@ -4,15 +4,17 @@
 Defines Pydantic models for the schedule-related tools and neo4j nodes
 """
 import json
+import time
 import asyncio
 import logging
 from langchain_ollama import ChatOllama
-from typing import Optional, Type
+from typing import Optional, Dict, Tuple, Callable, Awaitable, Final, LiteralString
 
 from langchain_core.tools import StructuredTool
-from pydantic import ValidationError, BaseModel
+from pydantic import ValidationError
 
 from max_assistant.clients.neo4j_client import Neo4jClient
+from max_assistant.config import SCHEDULE_CACHE_TTL
 from max_assistant.models.schedule_models import (
     Appointment,
     DailyRoutine,
@@ -22,6 +24,60 @@ from max_assistant.tools.registry import BaseToolProvider
 
 logger = logging.getLogger(__name__)
 
+# Read queries are fixed strings, built once at import rather than per tool call.
+APPOINTMENTS_FOR_DATE_QUERY: Final[LiteralString] = """
+    WITH datetime($targetDate) AS dt
+    OPTIONAL MATCH (d:Day {year: dt.year, month: dt.month, day: dt.day})
+    OPTIONAL MATCH (d)-[:HAS_APPOINTMENT]->(appt:Appointment)
+    WITH appt WHERE appt IS NOT NULL
+    RETURN properties(appt) AS appointment
+    """
+
+ROUTINES_FOR_DATE_QUERY: Final[LiteralString] = """
+    WITH datetime($targetDate) AS dt
+    WITH CASE dt.dayOfWeek
+        WHEN 1 THEN 'Monday' WHEN 2 THEN 'Tuesday' WHEN 3 THEN 'Wednesday'
+        WHEN 4 THEN 'Thursday' WHEN 5 THEN 'Friday' WHEN 6 THEN 'Saturday'
+        ELSE 'Sunday'
+    END AS dowString
+    MATCH (u:User)
+    OPTIONAL MATCH (u)-[:ATTENDS]->(routine:DailyRoutine)
+    WHERE dowString IN routine.dayOfWeek
+    WITH routine WHERE routine IS NOT NULL
+    RETURN properties(routine) AS routine
+    """
+
+# Appointments and routines for one day in a single round-trip, as one record of two lists.
+FULL_SCHEDULE_QUERY: Final[LiteralString] = """
+    WITH datetime($targetDate) AS dt
+    CALL {
+        WITH dt
+        OPTIONAL MATCH (d:Day {year: dt.year, month: dt.month, day: dt.day})
+        OPTIONAL MATCH (d)-[:HAS_APPOINTMENT]->(appt:Appointment)
+        RETURN collect(properties(appt)) AS appointments
+    }
+    CALL {
+        WITH dt
+        WITH CASE dt.dayOfWeek
+            WHEN 1 THEN 'Monday' WHEN 2 THEN 'Tuesday' WHEN 3 THEN 'Wednesday'
+            WHEN 4 THEN 'Thursday' WHEN 5 THEN 'Friday' WHEN 6 THEN 'Saturday'
+            ELSE 'Sunday'
+        END AS dowString
+        OPTIONAL MATCH (:User)-[:ATTENDS]->(routine:DailyRoutine)
+        WHERE dowString IN routine.dayOfWeek
+        RETURN collect(properties(routine)) AS routines
+    }
+    RETURN appointments, routines
+    """
+
+ACTIVITIES_QUERY: Final[LiteralString] = """
+    MATCH (u:User)
+    OPTIONAL MATCH (u)-[:ATTENDS]->(routine:DailyRoutine)
+    WHERE routine.type in $type_list
+    WITH routine WHERE routine IS NOT NULL
+    RETURN properties(routine) AS routine
+    """
+
 
 class ScheduleTools(BaseToolProvider):
     def __init__(self, db_client: Neo4jClient, llm: ChatOllama = None):
@@ -29,47 +85,54 @@ class ScheduleTools(BaseToolProvider):
         Initializes the toolset with a specific Neo4j client.
         """
         super().__init__(db_client, llm)
-        logger.info("PersonTools initialized with a Neo4j client.")
-
+        # Day-scoped query results keyed by (query name, date): (timestamp, json result)
+        self._schedule_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        # One lock per key, so concurrent misses for the same key run a single query.
+        self._schedule_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        logger.info("ScheduleTools initialized with a Neo4j client.")
 
-    async def _query_and_validate_nodes(
-            self,
-            query: str,
-            params: dict,
-            model_class: Type[BaseModel],
-            result_key: str
-    ) -> str:
+    async def _cached_query(self, key: Tuple[str, str], loader: Callable[[], Awaitable[str]]) -> str:
         """
-        Private helper to execute a query, validate results against a
-        Pydantic model, and return a JSON string.
+        Private helper to return a cached query result if it is younger than
+        SCHEDULE_CACHE_TTL, otherwise runs the loader and caches its result.
+        Error results (JSON objects rather than lists) are not cached.
         """
-        logger.debug(f"Executing query with params: {params} for model: {model_class.__name__}")
-        result = await self.db_client.execute_query(query, params)
-
-        # --- Pydantic Validation Step ---
-        if "error" in result:
-            return json.dumps(result)
-
-        try:
-            # Generic: extract nodes using the provided result_key
-            raw_nodes = [item[result_key] for item in result.get("data", [])]
+        cached = self._schedule_cache.get(key)
+        if cached and time.monotonic() - cached[0] < SCHEDULE_CACHE_TTL:
+            logger.debug(f"Schedule cache hit for {key}")
+            return cached[1]
+
+        lock = self._schedule_locks.get(key)
+        if lock is None:
+            lock = self._schedule_locks[key] = asyncio.Lock()
+        async with lock:
+            # Another caller may have refreshed the entry while we waited.
+            cached = self._schedule_cache.get(key)
+            if cached and time.monotonic() - cached[0] < SCHEDULE_CACHE_TTL:
+                return cached[1]
+
+            result = await loader()
+            if result.startswith("["):
+                self._schedule_cache[key] = (time.monotonic(), result)
+        self._prune_schedule_cache()
+        return result
+
+    def _prune_schedule_cache(self):
+        """
+        Private helper to drop expired cache entries (e.g. past dates) and the
+        locks of keys that are neither cached nor currently being queried.
+        """
+        now = time.monotonic()
+        for key in [k for k, (ts, _) in self._schedule_cache.items() if now - ts >= SCHEDULE_CACHE_TTL]:
+            del self._schedule_cache[key]
+        for key in [k for k, lock in self._schedule_locks.items()
+                    if k not in self._schedule_cache and not lock.locked()]:
+            del self._schedule_locks[key]
 
-            # Generic: validate against the provided model_class
-            validated_nodes = [model_class.model_validate(node) for node in raw_nodes]
-
-            # Convert validated models to JSON
-            return json.dumps([node.model_dump(mode='json') for node in validated_nodes], indent=2)
-
-        except ValidationError as e:
-            logger.error(f"Validation error for {model_class.__name__}: {e.errors()}")
-            return json.dumps({"error": "Data validation failed", "details": e.errors()})
-        except KeyError:
-            logger.error(f"Validation: Unexpected data structure from DB. Expected key '{result_key}'.")
-            return json.dumps({"error": "Data parsing failed",
-                               "details": f"Unexpected data structure from DB. Missing key: {result_key}"})
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return json.dumps({"error": "Data parsing failed", "details": "Unexpected error."})
+    def invalidate_schedule_cache(self):
+        """Clears all cached schedule results, e.g. after the schedule is modified."""
+        self._schedule_cache.clear()
+        self._prune_schedule_cache()
 
 
     async def get_appointments_for_date(self, target_date: str) -> str:
@@ -80,26 +143,18 @@ class ScheduleTools(BaseToolProvider):
         The target_date arg must be a valid iso date string.
         """
         logger.info(f"Tool: get_appointments_for_date for {target_date}")
-        query = """
-                WITH datetime($targetDate) AS dt
-                    OPTIONAL MATCH (d: Day {year : dt.year
-                   , month : dt.month
-                   , day : dt.day})
-                    OPTIONAL MATCH (d)-[:HAS_APPOINTMENT]-
-                   >(appt:Appointment)
-                WITH appt
-                WHERE appt IS NOT NULL
-                    RETURN properties(appt) AS appointment \
-                """
 
         params = {"targetDate": target_date}
 
         # Call the same helper with a different model and key
-        return await self._query_and_validate_nodes(
-            query,
-            params,
-            model_class=Appointment,
-            result_key="appointment"
+        return await self._cached_query(
+            ("appointments", target_date[:10]),
+            lambda: self._query_and_validate_nodes(
+                APPOINTMENTS_FOR_DATE_QUERY,
+                params,
+                model_class=Appointment,
+                result_key="appointment"
+            )
         )
 
 
@@ -110,28 +165,18 @@ class ScheduleTools(BaseToolProvider):
         questions, use 'get_full_schedule'. The target_date arg must be a valid iso date string.
         """
         logger.info(f"Tool: get_routines_for_date for {target_date}")
-        query = """
-                WITH datetime($targetDate) AS dt
-                WITH CASE dt.dayOfWeek
-                    WHEN 1 THEN 'Monday' WHEN 2 THEN 'Tuesday' WHEN 3 THEN 'Wednesday'
-                    WHEN 4 THEN 'Thursday' WHEN 5 THEN 'Friday' WHEN 6 THEN 'Saturday'
-                    ELSE 'Sunday' \
-                END AS dowString
-                MATCH (u:User)
-                OPTIONAL MATCH (u)-[:ATTENDS]->(routine:DailyRoutine)
-                WHERE dowString IN routine.dayOfWeek
-                WITH routine WHERE routine IS NOT NULL
-                RETURN properties(routine) AS routine \
-                """
 
         params = {"targetDate": target_date}
 
         # Call the helper
-        return await self._query_and_validate_nodes(
-            query,
-            params,
-            model_class=DailyRoutine,
-            result_key="routine"
+        return await self._cached_query(
+            ("routines", target_date[:10]),
+            lambda: self._query_and_validate_nodes(
+                ROUTINES_FOR_DATE_QUERY,
+                params,
+                model_class=DailyRoutine,
+                result_key="routine"
+            )
         )
 
 
@@ -143,31 +188,35 @@ class ScheduleTools(BaseToolProvider):
         The target_date arg must be a valid iso date string.
         """
         logger.info(f"Tool: get_full_schedule for {target_date}")
+        return await self._cached_query(
+            ("full_schedule", target_date[:10]),
+            lambda: self._load_full_schedule(target_date)
+        )
 
-        try:
-            # Run both tools at the same time
-            results = await asyncio.gather(
-                self.get_appointments_for_date(target_date),
-                self.get_routines_for_date(target_date, )
-            )
 
-            appts_json_str, routines_json_str = results
+    async def _load_full_schedule(self, target_date: str) -> str:
+        """
+        Private helper that fetches appointments and routines for a day in a single
+        round-trip, validates them and returns them as one list sorted by time.
+        """
+        result = await self.db_client.execute_query(
+            FULL_SCHEDULE_QUERY, {"targetDate": target_date}, read_only=True
+        )
 
-            # Parse the JSON results from both tools
-            appts = json.loads(appts_json_str)
-            routines = json.loads(routines_json_str)
+        if "error" in result:
+            logger.error(f"Error from full schedule query: {result}")
+            return json.dumps(result)
 
-            # Check if either tool returned an error
-            if isinstance(appts, dict) and 'error' in appts:
-                logger.error(f"Error from get_appointments: {appts}")
-                return json.dumps(appts)
-            if isinstance(routines, dict) and 'error' in routines:
-                logger.error(f"Error from get_routines: {routines}")
-                return json.dumps(routines)
+        try:
+            data = result.get("data", [])
+            record = data[0] if data else {"appointments": [], "routines": []}
+            appts = [Appointment.model_validate(node) for node in record["appointments"]]
+            routines = [DailyRoutine.model_validate(node) for node in record["routines"]]
 
             # Combine the two lists
             combined_list = []
             for item in appts + routines:
+                item = item.model_dump(mode='json')
                 combined_list.append({key: item[key] for key in ['time', 'title', 'duration', 'details']})
 
             # Sort the combined list by 'time'
@@ -180,8 +229,11 @@ class ScheduleTools(BaseToolProvider):
             logger.info(f"Returning combined schedule with {len(sorted_list)} items.")
             return json.dumps(sorted_list, indent=2)
 
+        except ValidationError as e:
+            logger.error(f"Validation error in get_full_schedule: {e.errors()}")
+            return json.dumps({"error": "Data validation failed", "details": e.errors()})
         except Exception as e:
-            # Catch-all for any other errors (like JSON parsing)
+            # Catch-all for any other errors (like unexpected result shapes)
             error_type = e.__class__.__name__
             logger.error(f"Unexpected error in get_full_schedule: {e}", exc_info=True)
             return json.dumps({"error": f"Internal error combining schedule: {error_type}"})
@@ -200,7 +252,7 @@ class ScheduleTools(BaseToolProvider):
         # LangChain/LangGraph will automatically validate the LLM's
         # input using the 'CreateAppointmentArgs' type hint on the decorator.
 
-        print(f"Tool: Calling create_appointment with args: {title}")
+        logger.info(f"Tool: create_appointment for '{title}'")
 
         # We can reliably build the params dict for our query
         params = {
@@ -226,6 +278,8 @@ class ScheduleTools(BaseToolProvider):
 
         # The client returns a dict, so we just dump it to a string for the LLM
         result = await self.db_client.execute_query(query, params)
+        if "error" not in result:
+            self.invalidate_schedule_cache()
         return json.dumps(result, indent=2)
 
 
@@ -240,21 +294,17 @@ class ScheduleTools(BaseToolProvider):
         """
         logger.info(f"Tool: get_routine_info for type")
 
-        query = """
-                MATCH (u:User)
-                OPTIONAL MATCH (u)-[:ATTENDS]->(routine:DailyRoutine)
-                WHERE routine.type in $type_list
-                WITH routine WHERE routine IS NOT NULL
-                RETURN properties(routine) AS routine 
-                """
 
         params = {"type_list": ['activity', 'exercise']}
 
-        return await self._query_and_validate_nodes(
-            query,
-            params,
-            model_class=DailyRoutine,
-            result_key="routine"
+        return await self._cached_query(
+            ("activities", ""),
+            lambda: self._query_and_validate_nodes(
+                ACTIVITIES_QUERY,
+                params,
+                model_class=DailyRoutine,
+                result_key="routine"
+            )
         )
 
     def get_tools(self) -> list:
@@ -8,7 +8,7 @@ import logging
 from langchain_core.tools import tool
 from pydantic import BaseModel
 
-from max_assistant.utils.datetime_utils import current_datetime
+from max_assistant.utils.datetime_utils import turn_datetime
 
 
 class GetCurrentDateTimeInput(BaseModel):
@@ -24,4 +24,5 @@ async def get_current_datetime() -> dict:
     This tool does not take any parameters.
     """
     logging.info("Fetching current time")
-    return current_datetime()
+    # Stable within a turn, so repeated calls agree with each other and the prompt.
+    return turn_datetime()
@@ -4,11 +4,51 @@
     Collection of utility functions for working with datetimes to ensure consistent formatting.
 
 """
-from datetime import datetime
+import time
+from contextvars import ContextVar
+
+# The datetime pinned for the current agent turn, see pin_turn_datetime().
+_turn_datetime: ContextVar[dict | None] = ContextVar("turn_datetime", default=None)
+
+
+# (epoch minute, result) of the last current_datetime() call.
+_minute_cache: tuple[int, dict] = (-1, {})
+
 
 def current_datetime() -> dict:
-    dt_str = datetime.now().strftime("%Y-%m-%dT%H:%M")
-    day = datetime.now().isoweekday()
-    month = datetime.now().strftime("%B")
-    year = datetime.now().year
-    return {'ISODateTime': dt_str, 'Day': day, 'Month': month, 'Year': year}
\ No newline at end of file
+    """
+    Returns the current local date and time at minute resolution.
+    The result only changes once a minute, so it is computed once per minute and
+    shared between callers; treat it as read-only.
+    """
+    global _minute_cache
+    epoch = time.time()
+    minute = int(epoch // 60)
+    if minute == _minute_cache[0]:
+        return _minute_cache[1]
+
+    # Read the clock once, so all fields agree (e.g. across midnight) and no
+    # datetime objects are built.
+    now = time.localtime(epoch)
+    dt_str = time.strftime("%Y-%m-%dT%H:%M", now)
+    day = now.tm_wday + 1  # ISO weekday, Monday is 1
+    month = time.strftime("%B", now)
+    year = now.tm_year
+    result = {'ISODateTime': dt_str, 'Day': day, 'Month': month, 'Year': year}
+    _minute_cache = (minute, result)
+    return result
+
+
+def pin_turn_datetime() -> dict:
+    """
+    Fixes the datetime for the turn that is about to run in this context, so the
+    prompt and any time tool calls within the turn all see the same timestamp.
+    """
+    value = current_datetime()
+    _turn_datetime.set(value)
+    return value
+
+
+def turn_datetime() -> dict:
+    """Returns the datetime pinned for the current turn, or the current datetime if none is pinned."""
+    return _turn_datetime.get() or current_datetime()
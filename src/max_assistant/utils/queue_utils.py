@@ -0,0 +1,88 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+    Lightweight queue primitives for passing messages between asyncio tasks.
+
+"""
+import asyncio
+from collections import deque
+from typing import Deque, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class AsyncDeque(Generic[T]):
+    """
+    A FIFO queue for a single consumer task, backed by collections.deque.
+    Unlike asyncio.Queue it only allocates a wake-up future when the consumer
+    actually has to wait, instead of on every operation. The interface mirrors
+    the subset of asyncio.Queue used in this project, including its exceptions.
+    If maxsize is greater than 0, put() blocks while the queue is full.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self._items: Deque[T] = deque()
+        self._getter: asyncio.Future | None = None
+        self._putters: Deque[asyncio.Future] = deque()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self._items)
+
+    def put_nowait(self, item: T):
+        """Appends an item, raising asyncio.QueueFull if the queue is full."""
+        if self.full():
+            raise asyncio.QueueFull
+        self._items.append(item)
+        if self._getter is not None and not self._getter.done():
+            self._getter.set_result(None)
+
+    async def put(self, item: T):
+        """Appends an item, waiting for space if the queue is full."""
+        while self.full():
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                putter.cancel()
+                try:
+                    self._putters.remove(putter)
+                except ValueError:
+                    pass
+                # If this putter was woken before being cancelled, pass the free slot on.
+                if not self.full() and not putter.cancelled():
+                    self._wake_next_putter()
+                raise
+        self.put_nowait(item)
+
+    def get_nowait(self) -> T:
+        """Removes and returns the oldest item, raising asyncio.QueueEmpty if there is none."""
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        self._wake_next_putter()
+        return item
+
+    async def get(self) -> T:
+        """Removes and returns the oldest item, waiting for one if the queue is empty."""
+        while not self._items:
+            self._getter = asyncio.get_running_loop().create_future()
+            try:
+                await self._getter
+            finally:
+                self._getter = None
+        return self.get_nowait()
+
+    def _wake_next_putter(self):
+        while self._putters:
+            putter = self._putters.popleft()
+            if not putter.done():
+                putter.set_result(None)
+                return
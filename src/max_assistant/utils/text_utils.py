@@ -0,0 +1,72 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+    Collection of utility functions for working with streamed LLM text.
+
+"""
+import re
+from typing import List, Tuple
+
+# A sentence ends at '.', '!' or '?' followed by whitespace, or at a line break.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Titles whose trailing period never ends a sentence, since a name follows
+# (compared lowercased, without the final '.').
+_TITLES = frozenset({"mr", "mrs", "ms", "dr", "st", "prof", "mt"})
+
+# Abbreviations that may also end a sentence, so their period only does if the
+# next word is capitalized: 'at 3 p.m. tomorrow' versus 'at 3 p.m. Then'.
+# Dotted initialisms such as 'U.S.' and 'e.g.' are handled the same way.
+_ABBREVIATIONS = frozenset({"jr", "sr", "vs", "etc", "e.g", "i.e", "a.m", "p.m"})
+_INITIALISM = re.compile(r"(?:[A-Za-z]\.)+[A-Za-z]")
+
+# Start of a tool call that the model wrote as raw JSON text instead of a
+# structured call, e.g. '{"name": "get_full_schedule", "parameters": {...}}'.
+# Scalar fields such as Llama 3's '"type": "function",' may come before the name.
+_JSON_SCALAR_FIELD = r'"(?:[^"\\]|\\.)*"\s*:\s*(?:"(?:[^"\\]|\\.)*"|[\w.+-]+)\s*,\s*'
+_RAW_TOOL_CALL_START = re.compile(rf'\s*\{{\s*(?:{_JSON_SCALAR_FIELD})*"(?:name|parameters)"\s*:')
+
+
+def is_raw_tool_call(text: str) -> bool:
+    """True if text starts like a tool call written as raw JSON rather than a reply."""
+    return _RAW_TOOL_CALL_START.match(text) is not None
+
+
+def _period_ends_sentence(word: str, next_word: str | None) -> bool | None:
+    """
+    Decides whether the period ending word also ends the sentence, given the
+    word that follows it. Returns None if that depends on a next word that
+    hasn't been streamed yet.
+    """
+    stem = word.lstrip("\"'([")[:-1]
+    if stem.lower() in _TITLES:
+        return False
+    if stem.lower() in _ABBREVIATIONS or _INITIALISM.fullmatch(stem):
+        return None if next_word is None else next_word[0].isupper()
+    if len(stem) == 1 and stem.isupper() and stem != "I":
+        # An initial, as in 'J. Smith', is followed by a capitalized name.
+        return None if next_word is None else not next_word[0].isupper()
+    return True
+
+
+def split_sentences(text: str) -> Tuple[List[str], str]:
+    """
+    Splits text into complete sentences and the trailing, possibly incomplete, remainder.
+    A period after a title, abbreviation or initial (e.g. 'Dr. Smith', 'p.m. today')
+    does not end a sentence.
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        sentence = text[start:match.start()]
+        if "\n" not in match.group() and sentence.endswith("."):
+            following = text[match.end():].split(None, 1)
+            ends = _period_ends_sentence(sentence.rsplit(None, 1)[-1], following[0] if following else None)
+            if ends is None:
+                break  # Wait for the next word to decide
+            if not ends:
+                continue
+        if sentence.strip():
+            sentences.append(sentence.strip())
+        start = match.end()
+    return sentences, text[start:]
@@ -0,0 +1,52 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+Tests for the Agent's sentence-by-sentence streaming.
+"""
+import asyncio
+from typing import List
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from max_assistant.agent.agent import Agent
+
+
+class _FakeEngine:
+    """Replays one chat model response as astream_events v2 events, token by token."""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+
+    async def astream_events(self, inputs, version):
+        yield {"event": "on_chat_model_start", "data": {}, "parent_ids": ["graph"]}
+        for token in self.tokens:
+            yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content=token)}, "parent_ids": ["graph"]}
+        output = AIMessage(content="".join(self.tokens))
+        yield {"event": "on_chat_model_end", "data": {"output": output}, "parent_ids": ["graph"]}
+        yield {"event": "on_chain_end", "data": {"output": {"messages": [output]}}, "parent_ids": []}
+
+
+def _stream(tokens: List[str]) -> List[str]:
+    agent = Agent(_FakeEngine(tokens), initial_user_info={})
+
+    async def collect():
+        return [sentence async for sentence in agent.astream("hello")]
+
+    return asyncio.run(collect())
+
+
+def test_sentences_are_yielded_as_they_complete():
+    assert _stream(["Good morning. ", "You have ", "no appointments", " today."]) == [
+        "Good morning.", "You have no appointments today."
+    ]
+
+
+def test_raw_tool_call_is_not_spoken():
+    tokens = ['{"type": ', '"function", ', '"name": "get_full_schedule", ', '"parameters": {}}']
+    assert _stream(tokens) == []
+
+
+def test_reply_starting_with_a_brace_is_held_back_then_spoken():
+    assert _stream(["{", "Sic", "} is a Latin word. ", "It means thus."]) == [
+        "{Sic} is a Latin word.", "It means thus."
+    ]
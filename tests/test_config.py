@@ -0,0 +1,28 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+Tests for reading numeric settings from the environment.
+"""
+from max_assistant.config import _env_float, _env_int
+
+
+def test_valid_values_are_used(monkeypatch):
+    monkeypatch.setenv("TEST_SETTING", "7")
+    assert _env_int("TEST_SETTING", 3, minimum=1) == 7
+    assert _env_float("TEST_SETTING", 3.0, minimum=0.0) == 7.0
+
+
+def test_unset_or_invalid_values_use_the_default(monkeypatch):
+    monkeypatch.delenv("TEST_SETTING", raising=False)
+    assert _env_int("TEST_SETTING", 3) == 3
+    monkeypatch.setenv("TEST_SETTING", "many")
+    assert _env_int("TEST_SETTING", 3) == 3
+    assert _env_float("TEST_SETTING", 3.0) == 3.0
+
+
+def test_values_below_the_minimum_use_the_default(monkeypatch):
+    monkeypatch.setenv("TEST_SETTING", "-1")
+    assert _env_int("TEST_SETTING", 10, minimum=4) == 10
+    assert _env_float("TEST_SETTING", 1.0, minimum=0.0) == 1.0
+    monkeypatch.setenv("TEST_SETTING", "0")
+    assert _env_int("TEST_SETTING", 10, minimum=1) == 10
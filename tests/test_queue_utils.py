@@ -0,0 +1,110 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+Tests for AsyncDeque, the single-consumer replacement for asyncio.Queue.
+"""
+import asyncio
+
+import pytest
+
+from max_assistant.utils.queue_utils import AsyncDeque
+
+
+def test_items_come_out_in_fifo_order():
+    async def run():
+        queue: AsyncDeque[int] = AsyncDeque()
+        for i in range(3):
+            await queue.put(i)
+        return [await queue.get() for _ in range(3)]
+
+    assert asyncio.run(run()) == [0, 1, 2]
+
+
+def test_get_waits_for_a_put():
+    async def run():
+        queue: AsyncDeque[str] = AsyncDeque()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        queue.put_nowait("item")
+        return await asyncio.wait_for(getter, timeout=1)
+
+    assert asyncio.run(run()) == "item"
+
+
+def test_put_nowait_raises_when_full():
+    queue: AsyncDeque[int] = AsyncDeque(maxsize=1)
+    queue.put_nowait(1)
+    assert queue.full()
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait(2)
+
+
+def test_get_nowait_raises_when_empty():
+    with pytest.raises(asyncio.QueueEmpty):
+        AsyncDeque().get_nowait()
+
+
+def test_put_blocks_at_maxsize_until_a_get():
+    async def run():
+        queue: AsyncDeque[int] = AsyncDeque(maxsize=1)
+        await queue.put(1)
+        putter = asyncio.create_task(queue.put(2))
+        await asyncio.sleep(0)
+        assert not putter.done()
+
+        assert await queue.get() == 1
+        await asyncio.wait_for(putter, timeout=1)
+        assert await queue.get() == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_get_does_not_lose_a_later_item():
+    async def run():
+        queue: AsyncDeque[int] = AsyncDeque()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        getter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await getter
+
+        queue.put_nowait(1)
+        assert await asyncio.wait_for(queue.get(), timeout=1) == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_put_does_not_add_its_item():
+    async def run():
+        queue: AsyncDeque[int] = AsyncDeque(maxsize=1)
+        await queue.put(1)
+        putter = asyncio.create_task(queue.put(2))
+        await asyncio.sleep(0)
+        putter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await putter
+
+        assert queue.get_nowait() == 1
+        assert queue.empty()
+        await asyncio.wait_for(queue.put(3), timeout=1)
+        assert queue.get_nowait() == 3
+
+    asyncio.run(run())
+
+
+def test_woken_putter_that_is_cancelled_passes_the_slot_on():
+    async def run():
+        queue: AsyncDeque[int] = AsyncDeque(maxsize=1)
+        await queue.put(1)
+        first = asyncio.create_task(queue.put(2))
+        second = asyncio.create_task(queue.put(3))
+        await asyncio.sleep(0)
+
+        queue.get_nowait()  # Wakes the first putter...
+        first.cancel()  # ...which is cancelled before it runs.
+        await asyncio.wait_for(second, timeout=1)
+        assert queue.get_nowait() == 3
+        assert first.cancelled()
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+Tests for the graph state's bounded message history.
+"""
+import asyncio
+from collections import deque
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, END
+
+from max_assistant.agent.state import GraphState, add_messages_bounded
+from max_assistant.config import MESSAGE_PRUNING_LIMIT
+
+
+def _build_graph():
+    """A two-node graph shaped like the reasoning engine: add the input, then reply."""
+    turn = 0
+
+    def prepare_input(state: GraphState):
+        return {"messages": [HumanMessage(content=state["transcribed_text"])]}
+
+    def call_model(state: GraphState):
+        nonlocal turn
+        turn += 1
+        return {"messages": [AIMessage(content=f"turn {turn}.")]}
+
+    workflow = StateGraph(GraphState)
+    workflow.add_node("prepare_input", prepare_input)
+    workflow.add_node("agent", call_model)
+    workflow.set_entry_point("prepare_input")
+    workflow.add_edge("prepare_input", "agent")
+    workflow.add_edge("agent", END)
+    return workflow.compile()
+
+
+def test_reducer_does_not_mutate_existing_history():
+    left = deque([HumanMessage(content="q0")], maxlen=MESSAGE_PRUNING_LIMIT)
+    result = add_messages_bounded(left, [AIMessage(content="a0")])
+
+    assert [m.content for m in left] == ["q0"]
+    assert [m.content for m in result] == ["q0", "a0"]
+
+
+def test_reducer_keeps_only_the_latest_messages():
+    left = [HumanMessage(content=str(i)) for i in range(MESSAGE_PRUNING_LIMIT)]
+    result = add_messages_bounded(left, [AIMessage(content="new")])
+
+    assert len(result) == MESSAGE_PRUNING_LIMIT
+    assert result[0].content == "1"
+    assert result[-1].content == "new"
+
+
+def test_two_turns_add_each_message_once():
+    graph = _build_graph()
+
+    async def run_turns():
+        messages = deque(maxlen=MESSAGE_PRUNING_LIMIT)
+        for question in ("q0", "q1"):
+            state = await graph.ainvoke({"transcribed_text": question, "messages": messages})
+            messages = state["messages"]
+        return messages
+
+    messages = asyncio.run(run_turns())
+    assert [m.content for m in messages] == ["q0", "turn 1.", "q1", "turn 2."]
@@ -0,0 +1,58 @@
+# Copyright (c) 2025, Robert Begg
+# Licensed under the MIT License. See LICENSE for more details.
+"""
+Tests for the streamed-text helpers.
+"""
+import pytest
+
+from max_assistant.utils.text_utils import is_raw_tool_call, split_sentences
+
+
+@pytest.mark.parametrize("title", ["Mr.", "Mrs.", "Ms.", "Dr.", "St.", "Prof.", "Mt."])
+def test_titles_do_not_end_a_sentence(title):
+    assert split_sentences(f"Ask {title} Smith. Then call me. ") == (
+        [f"Ask {title} Smith.", "Then call me."], ""
+    )
+
+
+@pytest.mark.parametrize("abbreviation", ["Jr.", "Sr.", "vs.", "etc.", "e.g.", "i.e.", "a.m.", "p.m."])
+def test_abbreviations_end_a_sentence_only_before_a_capital(abbreviation):
+    assert split_sentences(f"It is {abbreviation} today. ") == ([f"It is {abbreviation} today."], "")
+    assert split_sentences(f"It is {abbreviation} Then go. ") == ([f"It is {abbreviation}", "Then go."], "")
+
+
+def test_pronoun_i_ends_a_sentence():
+    assert split_sentences("Neither did I. Then we left. ") == (["Neither did I.", "Then we left."], "")
+
+
+def test_time_and_initialisms_stay_in_one_sentence():
+    assert split_sentences("See you at 3 p.m. tomorrow. ") == (["See you at 3 p.m. tomorrow."], "")
+    assert split_sentences("The U.S. team won. ") == (["The U.S. team won."], "")
+
+
+def test_initial_before_a_name_does_not_end_a_sentence():
+    assert split_sentences("Call J. Smith now. ") == (["Call J. Smith now."], "")
+
+
+def test_abbreviation_at_the_end_of_the_buffer_waits_for_the_next_word():
+    assert split_sentences("Hello. It is 3 p.m. ") == (["Hello."], "It is 3 p.m. ")
+
+
+def test_raw_tool_call_with_name_first():
+    assert is_raw_tool_call('{"name": "get_full_schedule", "parameters": {}}')
+    assert is_raw_tool_call('  {"parameters": {}, "name": "get_full_schedule"}')
+
+
+def test_raw_tool_call_with_leading_type_field():
+    assert is_raw_tool_call('{"type": "function", "name": "get_full_schedule", "parameters": {}}')
+
+
+def test_raw_tool_call_needs_the_name_key():
+    assert not is_raw_tool_call('{"type": "function"')
+    assert not is_raw_tool_call('{"na')
+    assert not is_raw_tool_call('{"text": {"name": "nested"}}')
+
+
+def test_prose_is_not_a_raw_tool_call():
+    assert not is_raw_tool_call("Your appointment is at noon.")
+    assert not is_raw_tool_call("{curly} braces in a sentence.")